@@ -0,0 +1,128 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+# Configuration
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+# Per-module overrides, e.g. "exam=WARNING,leads=DEBUG"
+LOG_LEVELS = os.getenv('LOG_LEVELS', '')
+# json: one JSON object per line, text: human-readable
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json').lower()
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+# Sampled messages (per frame / per call) are emitted at most once per key per interval
+LOG_SAMPLE_SECONDS = float(os.getenv('LOG_SAMPLE_SECONDS', '5'))
+
+# Attributes every LogRecord has; anything else came in through `extra`
+RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in RESERVED_ATTRS})
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record):
+        message = super().format(record)
+        fields = {key: value for key, value in vars(record).items() if key not in RESERVED_ATTRS}
+        return f"{message} {fields}" if fields else message
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Never blocks the caller: when the writer falls behind, records are dropped and counted."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogSampler:
+    """Rate-limits hot-path messages per key, reporting how many were suppressed in between."""
+
+    def __init__(self, interval_seconds=LOG_SAMPLE_SECONDS):
+        self.interval = interval_seconds
+        self.lock = threading.Lock()
+        self.last_emit = {}
+        self.suppressed = {}
+
+    def log(self, logger, level, key, msg, *args, **fields):
+        if not logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        with self.lock:
+            if now - self.last_emit.get(key, -self.interval) < self.interval:
+                self.suppressed[key] = self.suppressed.get(key, 0) + 1
+                return
+            self.last_emit[key] = now
+            suppressed = self.suppressed.pop(key, 0)
+        logger.log(level, msg, *args, extra={**fields, "suppressed": suppressed})
+
+    def forget(self, key):
+        with self.lock:
+            self.last_emit.pop(key, None)
+            self.suppressed.pop(key, None)
+
+
+queue_handler = None
+listener = None
+setup_lock = threading.Lock()
+
+
+def setup_logging():
+    """Routes the root logger through a bounded queue drained by a background thread; safe to call repeatedly."""
+    global queue_handler, listener
+    with setup_lock:
+        if listener is not None:
+            return
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+        queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+
+        root = logging.getLogger()
+        root.setLevel(LOG_LEVEL)
+        root.addHandler(queue_handler)
+        for override in filter(None, (item.strip() for item in LOG_LEVELS.split(","))):
+            name, _, level = override.partition("=")
+            logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+        listener = logging.handlers.QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+        listener.start()
+        # Flush what is still queued on shutdown
+        atexit.register(listener.stop)
+
+
+def get_logger(name):
+    setup_logging()
+    return logging.getLogger(name)
+
+
+def logging_stats():
+    return {
+        "queued": queue_handler.queue.qsize() if queue_handler else 0,
+        "dropped": queue_handler.dropped if queue_handler else 0
+    }
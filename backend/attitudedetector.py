@@ -1,31 +1,60 @@
-import cv2
 import numpy as np
-import librosa
-import whisper
-import torch
-from deepface import DeepFace
-from transformers import pipeline
-from scipy.signal import find_peaks
-import subprocess
 import os
-import boto3
-import aioboto3
-from moviepy.editor import VideoFileClip
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import shutil
 from fastapi import UploadFile
 from pathlib import Path
 import uuid
 from models.models import AttitudeAnalysis, Interview
 from sqlalchemy.orm import Session
+from inference_client import INFERENCE_SERVER_SOCKET, InferenceClient
+from lazy_models import LazyModel
+from video_sampler import sample_frames, probe_video, sampling_rate, MEDIA_SAMPLE_FPS, MEDIA_MAX_FRAMES
+from facial_emotion import load_emotion_model, classify_emotions
+from audio_decoder import decode_audio, AUDIO_SAMPLE_RATE
+from voice_features import voice_features
+from sentiment_scoring import score_transcript
+from media_workers import MEDIA_PARALLEL_BRANCHES, run_in_branch
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-# Check for CUDA (GPU acceleration)
-device = "cuda" if torch.cuda.is_available() else "cpu"
-
-# Load models
-whisper_model = whisper.load_model("base").to(device)
-sentiment_pipeline = pipeline("sentiment-analysis", device=0 if device == "cuda" else -1)
+# Configuration
+# Sampled frames per emotion model call
+MEDIA_EMOTION_BATCH_SIZE = int(os.getenv('MEDIA_EMOTION_BATCH_SIZE', '32'))
+# >1 splits the video into segments analyzed in separate processes (each loads its own model)
+MEDIA_EMOTION_WORKERS = int(os.getenv('MEDIA_EMOTION_WORKERS', '1'))
+# Shorter videos are not worth the process start-up and model load
+MEDIA_EMOTION_MIN_SEGMENT_SECONDS = float(os.getenv('MEDIA_EMOTION_MIN_SEGMENT_SECONDS', '60'))
+
+if INFERENCE_SERVER_SOCKET:
+    # Whisper, the sentiment pipeline and the emotion model live in inference_server.py
+    inference_client = InferenceClient()
+    transcriber = None
+    sentiment_pipeline = None
+    emotion_model = None
+else:
+    inference_client = None
+
+def get_device():
+    # Check for CUDA (GPU acceleration)
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+def load_transcriber():
+    # Engine picked by TRANSCRIPTION_BACKEND (openai-whisper, faster-whisper INT8 or whisper.cpp)
+    from transcription import create_transcriber
+    return create_transcriber()
+
+def load_sentiment_pipeline():
+    from transformers import pipeline
+    return pipeline("sentiment-analysis", device=0 if get_device() == "cuda" else -1)
+
+if not INFERENCE_SERVER_SOCKET:
+    # Loaded on first use (or by warm-up), not at import
+    transcriber = LazyModel("transcriber", load_transcriber, role="media")
+    sentiment_pipeline = LazyModel("sentiment", load_sentiment_pipeline, role="media")
+    emotion_model = LazyModel("emotion", load_emotion_model, role="media")
 
 # Organization's Culture Code (Example)
 org_culture = {
@@ -35,49 +64,73 @@ org_culture = {
     "calmness": 0.6
 }
 
-def extract_audio_from_video(video_path, output_audio_path="extracted_audio.wav"):
-    """Extracts audio from a video file and saves it as a WAV file."""
-    command = f"ffmpeg -i {video_path} -ac 1 -ar 44100 -vn {output_audio_path} -y"
+def transcribe(audio):
+    """Transcribes 16 kHz mono float32 PCM."""
+    if inference_client:
+        return inference_client.transcribe(audio)
+    return transcriber.get().transcribe(audio)
+
+def score_sentiment(texts):
+    """Classifies a batch of transcript windows, truncating any that exceed the model's limit."""
+    if inference_client:
+        return inference_client.sentiment(texts)
+    return sentiment_pipeline.get()(texts, batch_size=len(texts), truncation=True)
+
+def detect_emotions(frames):
+    """Returns the dominant facial emotion of each frame, classified as one batch."""
+    if inference_client:
+        return [result["dominant_emotion"] for result in inference_client.emotions(frames)]
+    return classify_emotions(emotion_model.get(), frames)
+
+def detect_emotions_safe(frames, batch_start):
     try:
-        subprocess.run(command, shell=True, check=True)
-        
-        # Check if audio file exists
-        if os.path.exists(output_audio_path) and os.path.getsize(output_audio_path) > 0:
-            print(f"✅ Audio extracted and saved as: {output_audio_path} ({os.path.getsize(output_audio_path)} bytes)")
-            return output_audio_path
-        else:
-            print("❌ Audio extraction failed: File not created or empty")
-            return None
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error extracting audio: {e}")
-        return None
+        return detect_emotions(frames)
+    except Exception as e:
+        print(f"Emotion detection failed on {len(frames)} frames from {batch_start:.1f}s, error: {e}")
+        return []
+
+def segment_emotions(video_path, start=0.0, end=None, sample_fps=MEDIA_SAMPLE_FPS, max_frames=MEDIA_MAX_FRAMES):
+    """Dominant emotions of the frames sampled from one segment of the video."""
+    emotions = []
+    batch = []
+    batch_start = start
+    for timestamp, frame in sample_frames(video_path, sample_fps, max_frames, start=start, end=end):
+        if not batch:
+            batch_start = timestamp
+        batch.append(frame)
+        if len(batch) == MEDIA_EMOTION_BATCH_SIZE:
+            emotions.extend(detect_emotions_safe(batch, batch_start))
+            batch = []
+    if batch:
+        emotions.extend(detect_emotions_safe(batch, batch_start))
+    return emotions
+
+def parallel_segment_emotions(video_path, duration, workers=MEDIA_EMOTION_WORKERS):
+    """Splits the video into one segment per worker process, keeping the overall sampling rate."""
+    rate = sampling_rate(duration)
+    bounds = np.linspace(0, duration, workers + 1)
+    frames_per_segment = max(1, MEDIA_MAX_FRAMES // workers)
+    # spawn: forking a process that already runs TensorFlow/PyTorch threads can deadlock
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [
+            pool.submit(segment_emotions, video_path, float(start), float(end), rate, frames_per_segment)
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+        return [emotion for future in futures for emotion in future.result()]
 
 def analyze_video(video_path):
     """Extracts facial expressions from video and determines emotion distribution."""
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        print("Error: Could not open video.")
+    try:
+        _, _, duration = probe_video(video_path)
+    except ValueError as e:
+        print(f"Error: Could not open video: {e}")
         return None
 
-    emotions = []
-    frame_count = 0
-
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        frame_count += 1
-        if frame_count % 10 == 0:  # Process every 10th frame
-            try:
-                result = DeepFace.analyze(frame, actions=['emotion'], enforce_detection=False)
-                emotion = result[0]['dominant_emotion'] if isinstance(result, list) else result['dominant_emotion']
-                emotions.append(emotion)
-            except Exception as e:
-                print(f"DeepFace failed on frame {frame_count}, error: {e}")
-                continue
-
-    cap.release()
+    # Time-based sampling (MEDIA_SAMPLE_FPS, capped at MEDIA_MAX_FRAMES), classified in batches
+    if MEDIA_EMOTION_WORKERS > 1 and duration and duration >= MEDIA_EMOTION_WORKERS * MEDIA_EMOTION_MIN_SEGMENT_SECONDS:
+        emotions = parallel_segment_emotions(video_path, duration)
+    else:
+        emotions = segment_emotions(video_path)
 
     # Calculate emotion distribution
     unique_emotions, counts = np.unique(emotions, return_counts=True)
@@ -85,30 +138,27 @@ def analyze_video(video_path):
 
     return emotion_distribution
 
-def analyze_audio(audio_path):
-    """Extracts tone & sentiment from voice."""
+def analyze_audio(audio):
+    """Extracts tone & sentiment from voice, given decode_audio() PCM."""
     # Convert speech to text
-    result = whisper_model.transcribe(str(audio_path))
+    result = transcribe(audio)
     transcript = result["text"]
 
-    # Get sentiment analysis
-    sentiment_result = sentiment_pipeline(transcript)
-    sentiment_label = sentiment_result[0]["label"]
-    sentiment_score = sentiment_result[0]["score"]
+    # Get sentiment analysis, window by window in batches
+    sentiment = score_transcript(result, score_sentiment)
 
-    # Extract audio pitch (proxy for enthusiasm)
-    y, sr = librosa.load(str(audio_path), sr=None)
-    pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
-
-    # Find peak pitch values
-    pitch_values = pitches[pitches > 0]  # Ignore zero values
-    pitch_mean = np.mean(pitch_values) if len(pitch_values) > 0 else 0
+    # Extract audio pitch (proxy for enthusiasm), pitch variance and speaking rate
+    voice = voice_features(audio, AUDIO_SAMPLE_RATE)
+    pitch_mean = voice["pitch_mean"]
 
     return {
         "transcript": transcript,
-        "sentiment": sentiment_label,
-        "positivity": sentiment_score,
-        "enthusiasm": min(1, pitch_mean / 300)  # Normalize enthusiasm (0-1)
+        "sentiment": sentiment["label"],
+        "positivity": sentiment["positivity"],
+        "sentiment_timeline": sentiment["timeline"],
+        "enthusiasm": min(1, pitch_mean / 300),  # Normalize enthusiasm (0-1)
+        "pitch_variance": voice["pitch_variance"],
+        "speaking_rate": voice["speaking_rate"]
     }
 
 
@@ -116,6 +166,7 @@ def analyze_audio(audio_path):
 # Function to extract audio
 def extract_audio(video_path, audio_path):
     """Extracts audio from video using MoviePy."""
+    from moviepy.editor import VideoFileClip
     try:
         video = VideoFileClip(video_path)
         video.audio.write_audiofile(audio_path, codec='pcm_s16le')
@@ -141,6 +192,7 @@ def compare_with_culture(attitude_params):
 
 def extract_audio(video_bytes: bytes, audio_file_path: str):
     """Extract audio from in-memory video and upload to S3."""
+    from moviepy.editor import VideoFileClip
     video = VideoFileClip(video_bytes)
     video.audio.write_audiofile(audio_file_path, codec="aac")
     return audio_file_path
@@ -153,9 +205,20 @@ def save_file_locally(uploaded_file: UploadFile, file_type: str):
         shutil.copyfileobj(uploaded_file.file, buffer)
     return str(file_path)
 
-def process_video_and_audio(db: Session, job_id, candidate_id,interview_id, video_path, audio_path):
-    video_analysis = analyze_video(video_path)
-    audio_analysis = analyze_audio(audio_path)
+def analyze_audio_file(media_path):
+    # One decode straight from the upload, shared by transcription, sentiment and pitch
+    return analyze_audio(decode_audio(media_path))
+
+def analyze_branches(video_path, audio_path=None):
+    """Runs the video and audio analyses concurrently in their own processes, or in sequence when disabled."""
+    if not MEDIA_PARALLEL_BRANCHES:
+        return analyze_video(video_path), analyze_audio_file(audio_path or video_path)
+    video_future = run_in_branch("video", analyze_video, video_path)
+    audio_future = run_in_branch("audio", analyze_audio_file, audio_path or video_path)
+    return video_future.result(), audio_future.result()
+
+def process_video_and_audio(db: Session, job_id, candidate_id,interview_id, video_path, audio_path=None):
+    video_analysis, audio_analysis = analyze_branches(video_path, audio_path)
 
     # Combine extracted attitude parameters
     attitude_parameters = {
@@ -0,0 +1,26 @@
+import os
+import subprocess
+import numpy as np
+
+# Configuration
+# Whisper's native rate; the sentiment and pitch stages use the same buffer
+AUDIO_SAMPLE_RATE = int(os.getenv('AUDIO_SAMPLE_RATE', '16000'))
+
+
+def decode_audio(path, sample_rate=AUDIO_SAMPLE_RATE):
+    """Decodes the audio track of any media file to mono float32 PCM in [-1, 1], without a temp file."""
+    command = [
+        "ffmpeg", "-v", "error", "-nostdin", "-i", str(path),
+        "-vn", "-ac", "1", "-ar", str(sample_rate),
+        "-f", "s16le", "-acodec", "pcm_s16le", "pipe:1"
+    ]
+    # communicate() drains stdout and stderr together, so a chatty ffmpeg cannot fill the
+    # stderr pipe and stall while we are still reading PCM
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    pcm = process.stdout
+    if process.returncode != 0:
+        stderr = process.stderr.decode(errors="replace")
+        raise RuntimeError(f"ffmpeg could not decode audio from {path}: {stderr.strip()}")
+    # Drop a trailing odd byte, if any, before viewing as int16
+    samples = np.frombuffer(pcm, dtype=np.int16, count=len(pcm) // 2)
+    return samples.astype(np.float32) / 32768.0
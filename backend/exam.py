@@ -1,153 +1,446 @@
-from fastapi import WebSocket, WebSocketDisconnect, Depends
+from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime
 import cv2
 import numpy as np
 import base64
 import asyncio
-import mediapipe as mp
-from ultralytics import YOLO
-import torch
-from ultralytics.nn.tasks import DetectionModel
+import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy.orm import Session
-from database.database import get_db
 from models.models import CandidateAssessment
+from inference_scheduler import InferenceScheduler
+from frame_protocol import (
+    negotiate_protocol, negotiate_annotation, negotiate_adaptive, parse_client_fps, frame_bytes, pack_message,
+    PROTOCOL_BINARY, ANNOTATE_ALWAYS, ANNOTATE_VIOLATIONS
+)
+from frame_ingest import LatestFrameSlot, FrameRateController, receive_frames
+from motion_gate import MotionGate
+from head_pose import HeadPoseEstimator, PROCTOR_FACE_AWAY_YAW_DEGREES
+from inference_client import INFERENCE_SERVER_SOCKET, RemotePhoneDetector
+from lazy_models import LazyModel
+from face_mesh_pool import FaceMeshPool, face_crop_box
+from proctoring_log import (
+    EventLog, load_persisted_session, persist_checkpoint, load_events,
+    PROCTOR_SCORE_CHECKPOINT_SECONDS, PROCTOR_SCORE_CHECKPOINT_FRAMES
+)
+from session_store import create_session_store, PROCTOR_SESSION_SYNC_SECONDS, PROCTOR_SESSION_RECENT_EVENTS
+from app_logging import get_logger, LogSampler, logging_stats
 
-# Override torch.load default behavior
-original_torch_load = torch.load
-torch.load = lambda *args, **kwargs: original_torch_load(*args, weights_only=False, **kwargs)
+logger = get_logger(__name__)
+# Per-frame lines are sampled per candidate instead of printed for every frame
+frame_log = LogSampler()
 
-# Load YOLOv8 model
-model = YOLO("yolov8x.pt", task="detect")
+# Configuration
+PROCTOR_FRAME_WORKERS = int(os.getenv('PROCTOR_FRAME_WORKERS', str(min(8, os.cpu_count() or 1))))
+PROCTOR_THUMBNAIL_WIDTH = int(os.getenv('PROCTOR_THUMBNAIL_WIDTH', '320'))
 
-# MediaPipe Face Mesh
-mp_face_mesh = mp.solutions.face_mesh
-face_mesh = mp_face_mesh.FaceMesh(static_image_mode=False, max_num_faces=5)
+def load_phone_detector():
+    # Backend and weights from PROCTOR_DETECTOR_*, or the shared inference
+    # server so this worker does not hold its own copy
+    if INFERENCE_SERVER_SOCKET:
+        return RemotePhoneDetector()
+    from phone_detector import PhoneDetector
+    return PhoneDetector()
+
+# Loaded on the first proctoring frame (or by warm-up), not at import
+phone_detector = LazyModel("phone_detector", load_phone_detector, role="proctoring")
+
+def detect_phones(frames):
+    return phone_detector.get().detect(frames)
+
+# Shared across all sockets so concurrent candidates share forward passes
+phone_scheduler = InferenceScheduler(detect_phones)
+
+# MediaPipe Face Mesh trackers, one leased per candidate session
+face_mesh_pool = FaceMeshPool()
+
+# Frame analysis (OpenCV, MediaPipe) releases the GIL, so it runs on a thread
+# pool instead of blocking the event loop that serves every other request.
+frame_executor = ThreadPoolExecutor(max_workers=PROCTOR_FRAME_WORKERS, thread_name_prefix="proctor-frame")
+
+PROCTOR_STAGES = ("queue", "decode", "motion_gate", "phone_detection", "face_detection", "face_mesh", "head_pose", "annotate", "encode", "total")
 
 # Detection log and honesty score tracking
 class CandidateSession:
-    def __init__(self):
-        self.detection_log = []
+    def __init__(self, candidate_assessment_id=None):
+        self.candidate_assessment_id = candidate_assessment_id
+        # Run-length encoded, capped and flushed to proctoring_events in batches
+        self.event_log = EventLog()
         self.total_frames = 0
         self.penalty_frames = 0
         self.last_honesty_score = 100.0
+        self.dropped_frames = 0
+        self.stage_totals = defaultdict(float)
+        # Last phone detections, reused while the scene is static
+        self.motion_gate = MotionGate()
+        self.last_detections = np.empty((0, 6), dtype=np.float32)
+        # Seeded with the previous frame's pose
+        self.head_pose = HeadPoseEstimator()
+        self.last_sync = 0.0
+        # Open sockets of this candidate on this worker; an overlapping reconnect shares the session
+        self.connections = 0
+        # Last honesty score written to the CandidateAssessment
+        self.checkpointed_score = None
+        self.checkpoint_frame = 0
+        self.last_checkpoint = time.monotonic()
+
+    def score_checkpoint_due(self):
+        return (
+            self.total_frames - self.checkpoint_frame >= PROCTOR_SCORE_CHECKPOINT_FRAMES
+            or time.monotonic() - self.last_checkpoint >= PROCTOR_SCORE_CHECKPOINT_SECONDS
+        )
 
-# Store sessions by candidate ID
+    def record_timings(self, timings):
+        for stage, elapsed in timings.items():
+            self.stage_totals[stage] += elapsed
+
+    def snapshot(self, ended=False):
+        """State shared through the session store."""
+        return {
+            "candidate_assessment_id": self.candidate_assessment_id,
+            "total_frames": self.total_frames,
+            "penalty_frames": self.penalty_frames,
+            "honesty_score": self.last_honesty_score,
+            "checkpointed_score": self.checkpointed_score,
+            "dropped_frames": self.dropped_frames,
+            "motion_skip_ratio": self.motion_gate.skip_ratio(),
+            "recent_events": self.event_log.entries()[-PROCTOR_SESSION_RECENT_EVENTS:],
+            "updated_at": datetime.now().isoformat(),
+            "worker": os.getpid(),
+            "ended": ended
+        }
+
+    def restore(self, state):
+        """Continues the counters of a session last served by another worker, or rebuilt from the database."""
+        self.total_frames = state["total_frames"]
+        self.penalty_frames = state["penalty_frames"]
+        self.last_honesty_score = state["honesty_score"]
+        self.checkpointed_score = state.get("checkpointed_score")
+        self.dropped_frames = state["dropped_frames"]
+        self.checkpoint_frame = self.total_frames
+
+    def average_timings(self):
+        if not self.total_frames:
+            return {}
+        return {stage: round(total / self.total_frames, 2) for stage, total in self.stage_totals.items()}
+
+# Store sessions by candidate ID (live sockets on this worker)
 candidate_sessions = {}
 
-async def websocket_endpoint(websocket: WebSocket, candidate_id: int, db: Session = Depends(get_db)):
+# Counters, honesty score and recent events shared with the other workers
+session_store = create_session_store()
+
+def elapsed_ms(start):
+    return round((time.perf_counter() - start) * 1000, 2)
+
+def timed(timings, stage, func, *args):
+    """Runs func and records its wall time in ms under timings[stage]."""
+    start = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        timings[stage] = elapsed_ms(start)
+
+def decode_frame(message):
+    """Decodes a JPEG/WebP frame sent either as raw bytes or as base64 text; None if it is not a valid image."""
+    try:
+        data = frame_bytes(message)
+    except (ValueError, TypeError):
+        return None
+    if not data:
+        return None
+    return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+
+def analyze_faces(frame, timings, face_mesh, head_pose):
+    """Counts faces, then runs FaceMesh and head-pose estimation on the primary face.
+
+    Returns the face flags and the landmarks that were computed.
+    """
+    flags = {
+        "face_away_detected": False,
+        "no_face_detected": False,
+        "multiple_faces_detected": False
+    }
+
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    h, w, _ = frame.shape
+    crop = None
+    if face_mesh.prefilter:
+        # Face boxes are enough for the no-face / multiple-faces checks
+        start = time.perf_counter()
+        faces = face_mesh.detect_faces(rgb_frame)
+        face_count = len(faces)
+        timings["face_detection"] = elapsed_ms(start)
+        if face_count == 0:
+            flags["no_face_detected"] = True
+            head_pose.reset()
+            return flags, []
+        # FaceMesh only sees the largest (primary) face, so a second person cannot take its landmarks
+        crop = face_crop_box(faces[0], w, h)
+
+    start = time.perf_counter()
+    if crop:
+        x0, y0, x1, y1 = crop
+        face_results = face_mesh.process(np.ascontiguousarray(rgb_frame[y0:y1, x0:x1]))
+    else:
+        face_results = face_mesh.process(rgb_frame)
+    timings["face_mesh"] = elapsed_ms(start)
+    face_landmarks = face_results.multi_face_landmarks or []
+    if crop:
+        # Back to full-frame coordinates for head pose and drawing
+        for face in face_landmarks:
+            for lm in face.landmark:
+                lm.x = (x0 + lm.x * (x1 - x0)) / w
+                lm.y = (y0 + lm.y * (y1 - y0)) / h
+
+    if not face_mesh.prefilter:
+        face_count = len(face_landmarks)
+        if face_count == 0:
+            flags["no_face_detected"] = True
+            head_pose.reset()
+            return flags, []
+
+    if face_count > 1:
+        flags["multiple_faces_detected"] = True
+
+    # The detector saw a face FaceMesh could not fit; there is no pose to judge
+    if not face_landmarks:
+        head_pose.reset()
+        return flags, []
+
+    # Head pose estimation
+    start = time.perf_counter()
+    try:
+        yaw = head_pose.estimate_yaw(face_landmarks[0].landmark, w, h)
+        if yaw is not None and yaw > PROCTOR_FACE_AWAY_YAW_DEGREES:
+            flags["face_away_detected"] = True
+    except cv2.error as e:
+        frame_log.log(logger, logging.WARNING, "pose_error", "Pose estimation error: %s", e)
+        head_pose.reset()
+        flags["face_away_detected"] = True
+    timings["head_pose"] = elapsed_ms(start)
+
+    return flags, face_landmarks
+
+# Pixel offsets approximating a radius-1 filled circle
+LANDMARK_DOT = np.array([[0, 0], [1, 0], [-1, 0], [0, 1], [0, -1]])
+
+def draw_landmarks(frame, face_landmarks):
+    """Marks every landmark with one vectorized pixel write instead of a cv2.circle per point."""
+    h, w = frame.shape[:2]
+    for face in face_landmarks:
+        points = np.array([(lm.x * w, lm.y * h) for lm in face.landmark], dtype=np.int32)
+        dots = (points[:, None, :] + LANDMARK_DOT[None, :, :]).reshape(-1, 2)
+        xs = np.clip(dots[:, 0], 0, w - 1)
+        ys = np.clip(dots[:, 1], 0, h - 1)
+        frame[ys, xs] = (0, 255, 0)
+
+def annotate_frame(frame, detections, face_landmarks, flags, max_width=None):
+    """Draws detections on the frame, downscaling it first when max_width is given."""
+    scale = 1.0
+    if max_width and frame.shape[1] > max_width:
+        scale = max_width / frame.shape[1]
+        frame = cv2.resize(frame, (max_width, int(frame.shape[0] * scale)), interpolation=cv2.INTER_AREA)
+
+    # Draw YOLO detections
+    for det in detections:
+        x1, y1, x2, y2, conf, cls = det * scale
+        cv2.rectangle(frame, (int(x1), int(y1)), (int(x2), int(y2)), (0, 0, 255), 2)
+        cv2.putText(frame, "Phone", (int(x1), int(y1) - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
+
+    # Draw face landmarks
+    draw_landmarks(frame, face_landmarks)
+
+    if flags["face_away_detected"]:
+        cv2.putText(frame, "Face Away", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+    if flags["no_face_detected"]:
+        cv2.putText(frame, "No Face", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+    return frame
+
+def encode_frame(frame):
+    _, buffer = cv2.imencode('.jpg', frame)
+    return buffer
+
+async def detect_phones_timed(frame, timings):
+    start = time.perf_counter()
+    detections = await phone_scheduler.submit(frame)
+    timings["phone_detection"] = elapsed_ms(start)
+    return detections
+
+async def detect_phones_gated(session, frame, timings):
+    """Runs phone detection unless the frame is unchanged since the last analyzed one."""
+    loop = asyncio.get_running_loop()
+    signature = await loop.run_in_executor(frame_executor, timed, timings, "motion_gate", session.motion_gate.signature, frame)
+    if session.motion_gate.should_skip(signature):
+        timings["phone_detection"] = 0.0
+        return session.last_detections
+
+    detections = await detect_phones_timed(frame, timings)
+    session.last_detections = detections
+    session.motion_gate.mark_analyzed(signature)
+    return detections
+
+async def send_message(websocket, protocol, message, payload=None):
+    if protocol == PROTOCOL_BINARY:
+        # Payload (annotated JPEG) travels as raw bytes after the header
+        await websocket.send_bytes(pack_message(message, payload))
+    else:
+        if payload is not None:
+            message["annotated_frame"] = base64.b64encode(payload).decode('utf-8')  # optional: to display in frontend
+        await websocket.send_json(message)
+
+def parse_assessment_id(websocket):
+    assessment_id = websocket.query_params.get("assessment_id")
+    return int(assessment_id) if assessment_id and assessment_id.isdigit() else None
+
+async def checkpoint(candidate_id, session, final=False):
+    """Persists pending event intervals and a changed honesty score without holding up the frame loop."""
+    intervals = session.event_log.drain() if final or session.event_log.flush_due() else []
+    honesty_score = None
+    # Without analyzed frames the score is only the restored (or default) one; never write it back
+    if session.total_frames and (final or session.score_checkpoint_due()):
+        session.checkpoint_frame = session.total_frames
+        session.last_checkpoint = time.monotonic()
+        if session.last_honesty_score != session.checkpointed_score:
+            honesty_score = session.last_honesty_score
+    if not intervals and honesty_score is None:
+        return
+    try:
+        await asyncio.get_running_loop().run_in_executor(
+            None, persist_checkpoint, candidate_id, session.candidate_assessment_id, intervals, honesty_score
+        )
+        if honesty_score is not None and session.candidate_assessment_id is not None:
+            session.checkpointed_score = honesty_score
+            if final:
+                logger.info("Updated honesty score for candidate %s: %s%%", candidate_id, honesty_score)
+    except Exception as e:
+        logger.error("Error checkpointing proctoring session for candidate %s: %s", candidate_id, e)
+        session.event_log.requeue(intervals)
+
+async def sync_session(candidate_id, session):
+    """Publishes the session's state to the shared store at most every PROCTOR_SESSION_SYNC_SECONDS."""
+    now = time.monotonic()
+    if now - session.last_sync < PROCTOR_SESSION_SYNC_SECONDS:
+        return
+    session.last_sync = now
+    try:
+        await asyncio.get_running_loop().run_in_executor(None, session_store.save, candidate_id, session.snapshot())
+    except Exception as e:
+        logger.error("Error syncing proctoring session for candidate %s: %s", candidate_id, e)
+
+async def websocket_endpoint(websocket: WebSocket, candidate_id: int):
     await websocket.accept()
-    
+    loop = asyncio.get_running_loop()
+    protocol = negotiate_protocol(websocket)
+
     # Initialize or get candidate session
     if candidate_id not in candidate_sessions:
-        candidate_sessions[candidate_id] = CandidateSession()
+        # Pick up where another worker left off (e.g. after a reconnect)
+        try:
+            state = await loop.run_in_executor(None, session_store.load, candidate_id)
+        except Exception as e:
+            logger.error("Error loading proctoring session for candidate %s: %s", candidate_id, e)
+            state = None
+
+        if state is None or state["candidate_assessment_id"] is None:
+            # Nothing shared: continue from the persisted score and intervals
+            try:
+                persisted = await loop.run_in_executor(None, load_persisted_session, candidate_id, parse_assessment_id(websocket))
+            except Exception as e:
+                logger.error("Error loading persisted proctoring state for candidate %s: %s", candidate_id, e)
+                persisted = None
+            if state is None:
+                state = persisted
+            elif persisted:
+                state["candidate_assessment_id"] = persisted["candidate_assessment_id"]
+
+        session = CandidateSession(state["candidate_assessment_id"] if state else None)
+        if state:
+            session.restore(state)
+        candidate_sessions[candidate_id] = session
     session = candidate_sessions[candidate_id]
+    # Counted before the next await, so a closing overlapping connection does not clean it up
+    session.connections += 1
+    annotate_mode = negotiate_annotation(websocket)
+    # Keyed by connection: a reconnect of the same candidate gets its own tracker
+    connection_key = id(websocket)
+    rate_controller = FrameRateController(parse_client_fps(websocket)) if negotiate_adaptive(websocket) else None
+    receiver = None
 
     try:
-        while True:
-            data = await websocket.receive_text()
-            image_data = base64.b64decode(data)
-            np_data = np.frombuffer(image_data, np.uint8)
-            frame = cv2.imdecode(np_data, cv2.IMREAD_COLOR)
-
-            # YOLO - Detect phones (class 67)
-            results = model.predict(frame, conf=0.3, classes=[67])
-            detections = results[0].boxes.data.cpu().numpy()
-            phone_detected = len(detections) > 0
+        face_mesh = await loop.run_in_executor(frame_executor, face_mesh_pool.acquire, connection_key)
 
-            # Draw YOLO detections
-            for det in detections:
-                x1, y1, x2, y2, conf, cls = det
-                cv2.rectangle(frame, (int(x1), int(y1)), (int(x2), int(y2)), (0, 0, 255), 2)
-                cv2.putText(frame, "Phone", (int(x1), int(y1) - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
-
-            # MediaPipe Face Mesh
-            face_away_detected = False
-            no_face_detected = False
-            multiple_faces_detected = False
-
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            face_results = face_mesh.process(rgb_frame)
-
-            if face_results.multi_face_landmarks:
-                face_count = len(face_results.multi_face_landmarks)
-
-                if face_count > 1:
-                    multiple_faces_detected = True
-
-                # Draw face landmarks
-                for face_landmarks in face_results.multi_face_landmarks:
-                    for lm in face_landmarks.landmark:
-                        x, y = int(lm.x * frame.shape[1]), int(lm.y * frame.shape[0])
-                        cv2.circle(frame, (x, y), 1, (0, 255, 0), -1)
-
-                # Head pose estimation
-                landmarks = face_results.multi_face_landmarks[0].landmark
-                h, w, _ = frame.shape
-                image_points = np.array([
-                    [landmarks[1].x * w, landmarks[1].y * h],    # Nose tip
-                    [landmarks[33].x * w, landmarks[33].y * h],  # Left eye
-                    [landmarks[263].x * w, landmarks[263].y * h], # Right eye
-                    [landmarks[61].x * w, landmarks[61].y * h],   # Left mouth corner
-                    [landmarks[291].x * w, landmarks[291].y * h], # Right mouth corner
-                    [landmarks[199].x * w, landmarks[199].y * h], # Left eyebrow
-                    [landmarks[419].x * w, landmarks[419].y * h], # Right eyebrow
-                    [landmarks[4].x * w, landmarks[4].y * h],     # Nose bridge
-                    [landmarks[152].x * w, landmarks[152].y * h]  # Chin
-                ], dtype="double")
-
-                model_points = np.array([
-                    [0.0, 0.0, 0.0], [ -30.0, -30.0, -30.0], [30.0, -30.0, -30.0],
-                    [-30.0, 30.0, -30.0], [30.0, 30.0, -30.0], [-30.0, -40.0, -30.0],
-                    [30.0, -40.0, -30.0], [0.0, -10.0, -30.0], [0.0, 40.0, -30.0]
-                ])
-
-                focal_length = w
-                center = (w / 2, h / 2)
-                camera_matrix = np.array([
-                    [focal_length, 0, center[0]],
-                    [0, focal_length, center[1]],
-                    [0, 0, 1]
-                ], dtype="double")
+        # Frames are received on their own task; the loop below always analyzes the
+        # newest one and frames that arrived in the meantime are dropped.
+        slot = LatestFrameSlot()
+        receiver = asyncio.create_task(receive_frames(websocket, slot))
 
-                try:
-                    success, rotation_vector, _ = cv2.solvePnP(model_points, image_points, camera_matrix, None)
-                    if success:
-                        rmat, _ = cv2.Rodrigues(rotation_vector)
-                        proj_matrix = np.hstack((rmat, np.zeros((3, 1))))
-                        euler_angles, _, _, _, _, _, _ = cv2.decomposeProjectionMatrix(proj_matrix)
-                        yaw = abs(euler_angles[1, 0])
-                        if yaw > 20:
-                            face_away_detected = True
-                            cv2.putText(frame, "Face Away", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-                except cv2.error as e:
-                    print(f"Pose estimation error: {e}")
-                    face_away_detected = True
-            else:
-                no_face_detected = True
-                cv2.putText(frame, "No Face", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+        dropped_seen = 0
+
+        if rate_controller:
+            await send_message(websocket, protocol, rate_controller.current())
+
+        while True:
+            message, received_at = await slot.get()
+            frame_start = time.perf_counter()
+            timings = {"queue": elapsed_ms(received_at)}
+            frame = await loop.run_in_executor(frame_executor, timed, timings, "decode", decode_frame, message)
+            if frame is None:
+                # Truncated or corrupt image: count it as dropped rather than failing the session
+                session.dropped_frames += 1
+                frame_log.log(
+                    logger, logging.WARNING, ("undecodable", candidate_id), "Dropped undecodable proctoring frame",
+                    candidate_id=candidate_id, dropped_frames=session.dropped_frames
+                )
+                continue
+
+            # YOLO phone detection (class 67) and FaceMesh run concurrently; YOLO
+            # is skipped while the scene is static
+            detections, (face_flags, face_landmarks) = await asyncio.gather(
+                detect_phones_gated(session, frame, timings),
+                loop.run_in_executor(frame_executor, analyze_faces, frame, timings, face_mesh, session.head_pose)
+            )
+            phone_detected = len(detections) > 0
+            face_away_detected = face_flags["face_away_detected"]
+            no_face_detected = face_flags["no_face_detected"]
+            multiple_faces_detected = face_flags["multiple_faces_detected"]
 
             # Honesty score update
             session.total_frames += 1
             dishonesty_detected = phone_detected or face_away_detected or no_face_detected or multiple_faces_detected
             if dishonesty_detected:
                 session.penalty_frames += 1
-                session.detection_log.append({
-                    "timestamp": datetime.now().isoformat(),
-                    "frame": session.total_frames,
-                    "event": f"{'Phone' if phone_detected else ''} {'Face Away' if face_away_detected else ''} {'No Face' if no_face_detected else ''} {'Multiple Faces' if multiple_faces_detected else ''}".strip()
-                })
+                session.event_log.record(
+                    session.total_frames,
+                    f"{'Phone' if phone_detected else ''} {'Face Away' if face_away_detected else ''} {'No Face' if no_face_detected else ''} {'Multiple Faces' if multiple_faces_detected else ''}".strip()
+                )
 
             honesty_score = round(100 * (1 - session.penalty_frames / session.total_frames), 2)
             session.last_honesty_score = honesty_score
 
-            # Log frame with timestamp
-            print(f"Candidate {candidate_id} | Frame {session.total_frames} | Honesty Score: {honesty_score}% | Time: {datetime.now().isoformat()}")
+            # Encode frame with annotations (optional): every frame at full size, or a
+            # thumbnail only when a violation was detected
+            annotated_jpeg = None
+            if annotate_mode == ANNOTATE_ALWAYS or (annotate_mode == ANNOTATE_VIOLATIONS and dishonesty_detected):
+                max_width = None if annotate_mode == ANNOTATE_ALWAYS else PROCTOR_THUMBNAIL_WIDTH
+                annotated = await loop.run_in_executor(frame_executor, timed, timings, "annotate", annotate_frame, frame, detections, face_landmarks, face_flags, max_width)
+                annotated_jpeg = await loop.run_in_executor(frame_executor, timed, timings, "encode", encode_frame, annotated)
+
+            timings["total"] = elapsed_ms(frame_start)
+            session.record_timings(timings)
+            dropped = slot.dropped - dropped_seen
+            dropped_seen = slot.dropped
+            session.dropped_frames += dropped
 
-            # Encode frame with annotations to base64 (optional)
-            _, buffer = cv2.imencode('.jpg', frame)
-            frame_base64 = base64.b64encode(buffer).decode('utf-8')
+            frame_log.log(
+                logger, logging.INFO, candidate_id, "Analyzed proctoring frame",
+                candidate_id=candidate_id, frame=session.total_frames, honesty_score=honesty_score, timings_ms=timings
+            )
 
-            await websocket.send_json({
+            result = {
                 "frame": session.total_frames,
                 "phone_detected": phone_detected,
                 "face_away_detected": face_away_detected,
@@ -155,39 +448,106 @@ async def websocket_endpoint(websocket: WebSocket, candidate_id: int, db: Sessio
                 "multiple_faces_detected": multiple_faces_detected,
                 "honesty_score": honesty_score,
                 "timestamp": datetime.now().isoformat(),
-                "annotated_frame": frame_base64  # optional: to display in frontend
-            })
+                "dropped_frames": session.dropped_frames,
+                "motion_skip_ratio": session.motion_gate.skip_ratio(),
+                "timings": timings
+            }
+            await send_message(websocket, protocol, result, annotated_jpeg)
 
-            await asyncio.sleep(0.1)
+            # Ask adaptive clients to slow down or speed up their capture loop
+            if rate_controller:
+                control = rate_controller.observe(timings["queue"] + timings["total"], dropped)
+                if control:
+                    await send_message(websocket, protocol, control)
+
+            await checkpoint(candidate_id, session)
+            await sync_session(candidate_id, session)
 
     except WebSocketDisconnect:
-        print(f"Client disconnected for candidate {candidate_id}")
-        # Update candidate assessment with final honesty score
+        logger.info("Client disconnected for candidate %s", candidate_id)
+    except Exception:
+        logger.exception("Proctoring session failed for candidate %s", candidate_id)
+    finally:
+        if receiver:
+            receiver.cancel()
+        # Resetting the tracker restarts its MediaPipe graph; keep that off the event loop
         try:
-            candidate_assessment = db.query(CandidateAssessment).filter(
-                CandidateAssessment.candidate_id == candidate_id
-            ).first()
-            
-            if candidate_assessment:
-                candidate_assessment.honesty_score = session.last_honesty_score
-                db.commit()
-                print(f"Updated honesty score for candidate {candidate_id}: {session.last_honesty_score}%")
+            await loop.run_in_executor(frame_executor, face_mesh_pool.release, connection_key)
         except Exception as e:
-            print(f"Error updating honesty score: {e}")
+            logger.error("Error releasing face tracker for candidate %s: %s", candidate_id, e)
+        # Final events and honesty score for this candidate's assessment, however the loop ended
+        try:
+            await checkpoint(candidate_id, session, final=True)
         finally:
-            # Clean up session
-            if candidate_id in candidate_sessions:
+            # Clean up the session once its last socket is gone, and only if a newer
+            # connection has not replaced it in the meantime
+            session.connections -= 1
+            if session.connections == 0 and candidate_sessions.get(candidate_id) is session:
                 del candidate_sessions[candidate_id]
+                frame_log.forget(candidate_id)
+                frame_log.forget(("undecodable", candidate_id))
+                # The shared entry is kept, marked ended, so a reconnect within the TTL
+                # (on any worker) restores the counters; it expires on its own
+                try:
+                    await loop.run_in_executor(None, session_store.save, candidate_id, session.snapshot(ended=True))
+                except Exception as e:
+                    logger.error("Error saving final proctoring session for candidate %s: %s", candidate_id, e)
 
-async def get_logs(candidate_id: int):
+async def get_logs(candidate_id: int, db: Session, assessment_id: int = None):
     if candidate_id not in candidate_sessions:
+        # Socket is served by another worker: use the shared state
+        state = await asyncio.get_running_loop().run_in_executor(None, session_store.load, candidate_id)
+        if state:
+            return {
+                "detection_log": state["recent_events"],
+                "honesty_score": state["honesty_score"],
+                "dropped_frames": state["dropped_frames"],
+                "motion_skip_ratio": state["motion_skip_ratio"]
+            }
+
+        # Session is gone: serve the persisted log
+        query = db.query(CandidateAssessment).filter(CandidateAssessment.candidate_id == candidate_id)
+        if assessment_id is not None:
+            query = query.filter(CandidateAssessment.assessment_id == assessment_id)
+        candidate_assessment = query.order_by(CandidateAssessment.id.desc()).first()
         return {
-            "detection_log": [],
-            "honesty_score": 100
+            "detection_log": load_events(db, candidate_id, assessment_id),
+            "honesty_score": candidate_assessment.honesty_score if candidate_assessment else 100
         }
-    
+
     session = candidate_sessions[candidate_id]
     return {
-        "detection_log": session.detection_log,
-        "honesty_score": session.last_honesty_score
-    } 
\ No newline at end of file
+        "detection_log": session.event_log.entries(),
+        "honesty_score": session.last_honesty_score,
+        "dropped_frames": session.dropped_frames,
+        "motion_skip_ratio": session.motion_gate.skip_ratio(),
+        "stage_latency_ms": session.average_timings()
+    }
+
+async def get_proctoring_stats():
+    """Per-stage latency averaged over all live sessions, plus batching stats."""
+    stage_totals = defaultdict(float)
+    total_frames = 0
+    motion_checked = 0
+    motion_skipped = 0
+    for session in candidate_sessions.values():
+        total_frames += session.total_frames
+        motion_checked += session.motion_gate.checked
+        motion_skipped += session.motion_gate.skipped
+        for stage, total in session.stage_totals.items():
+            stage_totals[stage] += total
+
+    return {
+        "active_sessions": len(candidate_sessions),
+        "frame_workers": PROCTOR_FRAME_WORKERS,
+        "phone_detector": phone_detector.get().describe() if phone_detector.loaded else phone_detector.status(),
+        "stage_latency_ms": {
+            stage: round(stage_totals[stage] / total_frames, 2) if total_frames else 0
+            for stage in PROCTOR_STAGES
+        },
+        "phone_batching": phone_scheduler.stats(),
+        "face_mesh_pool": face_mesh_pool.stats(),
+        "session_store": {"backend": session_store.name, "sessions": session_store.count()},
+        "motion_skip_ratio": round(motion_skipped / motion_checked, 3) if motion_checked else 0.0,
+        "logging": logging_stats()
+    }
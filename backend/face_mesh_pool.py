@@ -0,0 +1,157 @@
+import os
+import threading
+from lazy_models import LazyModel
+
+# Configuration
+PROCTOR_FACE_MESH_MAX_INSTANCES = int(os.getenv('PROCTOR_FACE_MESH_MAX_INSTANCES', '16'))
+PROCTOR_FACE_MESH_MAX_IDLE = int(os.getenv('PROCTOR_FACE_MESH_MAX_IDLE', '4'))
+# Count faces with the short-range BlazeFace detector and run FaceMesh on the primary face only
+PROCTOR_FACE_PREFILTER = os.getenv('PROCTOR_FACE_PREFILTER', 'true').lower() == 'true'
+PROCTOR_FACE_DETECTION_CONFIDENCE = float(os.getenv('PROCTOR_FACE_DETECTION_CONFIDENCE', '0.5'))
+# FaceMesh gets the primary face's box grown by this fraction of its size on every side
+PROCTOR_FACE_CROP_MARGIN = float(os.getenv('PROCTOR_FACE_CROP_MARGIN', '0.25'))
+
+def load_mediapipe():
+    import mediapipe as mp
+    return mp.solutions
+
+# MediaPipe is imported on the first session (or by warm-up), not at import
+mediapipe_solutions = LazyModel("mediapipe", load_mediapipe, role="proctoring")
+
+
+def create_face_mesh(static_image_mode=False):
+    # With the prefilter the detector counts faces, so landmarks are only needed for one
+    max_num_faces = 1 if PROCTOR_FACE_PREFILTER else 5
+    return mediapipe_solutions.get().face_mesh.FaceMesh(static_image_mode=static_image_mode, max_num_faces=max_num_faces)
+
+
+def create_face_detection():
+    return mediapipe_solutions.get().face_detection.FaceDetection(model_selection=0, min_detection_confidence=PROCTOR_FACE_DETECTION_CONFIDENCE)
+
+
+def face_crop_box(detection, w, h, margin=PROCTOR_FACE_CROP_MARGIN):
+    """Pixel box (x0, y0, x1, y1) around a BlazeFace detection, with a margin and clipped to the frame; None if empty."""
+    box = detection.location_data.relative_bounding_box
+    pad_x, pad_y = box.width * margin, box.height * margin
+    x0 = max(0, int((box.xmin - pad_x) * w))
+    y0 = max(0, int((box.ymin - pad_y) * h))
+    x1 = min(w, int((box.xmin + box.width + pad_x) * w))
+    y1 = min(h, int((box.ymin + box.height + pad_y) * h))
+    if x1 - x0 < 2 or y1 - y0 < 2:
+        return None
+    return x0, y0, x1, y1
+
+
+class FaceMeshLease:
+    """A FaceMesh graph and its face detector; the pool reuses this object, and its lock, with the graph."""
+
+    def __init__(self, face_mesh, face_detection=None, shared=False):
+        self.face_mesh = face_mesh
+        self.face_detection = face_detection
+        self.prefilter = face_detection is not None
+        self.shared = shared
+        # A MediaPipe graph must not be called from two threads at once; only
+        # contended for the shared overflow instance.
+        self.lock = threading.Lock()
+
+    def close(self):
+        self.face_mesh.close()
+        if self.face_detection is not None:
+            self.face_detection.close()
+
+    def reset(self):
+        """Clears the tracking state left by the previous connection's video before the graph is reused."""
+        with self.lock:
+            self.face_mesh.reset()
+            if self.face_detection is not None:
+                self.face_detection.reset()
+
+    def process(self, rgb_frame):
+        with self.lock:
+            return self.face_mesh.process(rgb_frame)
+
+    def detect_faces(self, rgb_frame):
+        """Returns the BlazeFace detections in the frame, largest box first."""
+        with self.lock:
+            results = self.face_detection.process(rgb_frame)
+        detections = results.detections or []
+        return sorted(
+            detections,
+            key=lambda d: d.location_data.relative_bounding_box.width * d.location_data.relative_bounding_box.height,
+            reverse=True
+        )
+
+
+class FaceMeshPool:
+    """Bounded pool of FaceMesh trackers (with their face detector), leased one per websocket connection.
+
+    A dedicated tracker keeps its temporal state to one candidate's video, so
+    tracking mode can skip detection between frames, and sessions run in
+    parallel threads. Leases are keyed by connection rather than candidate, so
+    a reconnect never shares (or releases) the old connection's tracker. Once
+    `max_instances` trackers are leased, further sessions share one
+    static-image-mode instance behind a lock.
+    """
+
+    def __init__(self, max_instances=PROCTOR_FACE_MESH_MAX_INSTANCES, max_idle=PROCTOR_FACE_MESH_MAX_IDLE):
+        self.max_instances = max_instances
+        self.max_idle = max_idle
+        self.lock = threading.Lock()
+        self.leases = {}
+        self.idle = []
+        self.created = 0
+        self.overflow = None
+
+    def acquire(self, key):
+        with self.lock:
+            if key in self.leases:
+                return self.leases[key]
+
+            if self.idle:
+                lease = self.idle.pop()
+            elif self.created < self.max_instances:
+                self.created += 1
+                lease = FaceMeshLease(create_face_mesh(), self._create_detector())
+            else:
+                if self.overflow is None:
+                    self.overflow = FaceMeshLease(create_face_mesh(static_image_mode=True), self._create_detector(), shared=True)
+                lease = self.overflow
+
+            self.leases[key] = lease
+            return lease
+
+    def release(self, key):
+        """Returns a connection's tracker to the pool, reset, or closes it if enough are idle already."""
+        with self.lock:
+            lease = self.leases.pop(key, None)
+            if lease is None or lease.shared:
+                return
+            keep = len(self.idle) < self.max_idle
+            if not keep:
+                self.created -= 1
+        if not keep:
+            lease.close()
+            return
+        try:
+            lease.reset()
+        except Exception:
+            # A graph that cannot be reset is not handed to another candidate
+            with self.lock:
+                self.created -= 1
+            lease.close()
+            return
+        with self.lock:
+            self.idle.append(lease)
+
+    def _create_detector(self):
+        return create_face_detection() if PROCTOR_FACE_PREFILTER else None
+
+    def stats(self):
+        with self.lock:
+            return {
+                "max_instances": self.max_instances,
+                "instances": self.created,
+                "leased": sum(1 for lease in self.leases.values() if not lease.shared),
+                "idle": len(self.idle),
+                "overflow_sessions": sum(1 for lease in self.leases.values() if lease.shared)
+            }
@@ -0,0 +1,45 @@
+from functools import lru_cache
+import cv2
+import numpy as np
+
+# Output order of DeepFace's Emotion model
+EMOTION_LABELS = ("angry", "disgust", "fear", "happy", "sad", "surprise", "neutral")
+EMOTION_INPUT_SIZE = 48
+# Faces are searched on a downscaled grayscale copy; the crop comes from full resolution
+FACE_SEARCH_WIDTH = 320
+
+
+def load_emotion_model():
+    """The Keras emotion classifier behind DeepFace.analyze(actions=['emotion'])."""
+    from deepface import DeepFace
+    model = DeepFace.build_model("Emotion")
+    # deepface >= 0.0.80 wraps the Keras model in a client
+    return getattr(model, "model", model)
+
+
+@lru_cache(maxsize=1)
+def face_cascade():
+    # Same OpenCV detector DeepFace uses by default
+    return cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
+
+
+def face_crop(frame, cascade):
+    """48x48 grayscale crop of the largest face, or of the whole frame when none is found."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    scale = min(1.0, FACE_SEARCH_WIDTH / gray.shape[1])
+    small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else gray
+    faces = cascade.detectMultiScale(small, scaleFactor=1.1, minNeighbors=5)
+    if len(faces):
+        x, y, w, h = (np.array(max(faces, key=lambda face: face[2] * face[3])) / scale).astype(int)
+        gray = gray[y:y + h, x:x + w]
+    return cv2.resize(gray, (EMOTION_INPUT_SIZE, EMOTION_INPUT_SIZE), interpolation=cv2.INTER_AREA)
+
+
+def classify_emotions(model, frames):
+    """Dominant emotion per frame, with one model call for the whole batch."""
+    if not frames:
+        return []
+    cascade = face_cascade()
+    batch = np.stack([face_crop(frame, cascade) for frame in frames]).astype(np.float32) / 255.0
+    scores = model.predict(batch[..., np.newaxis], batch_size=len(frames), verbose=0)
+    return [EMOTION_LABELS[i] for i in np.argmax(scores, axis=1)]
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import time
+from fastapi import WebSocketDisconnect
+
+# Configuration
+# Capture levels offered to adaptive clients, best first, as "fps:max_width" pairs
+PROCTOR_FPS_LEVELS = [
+    (float(fps), int(width))
+    for fps, width in (level.split(":") for level in os.getenv('PROCTOR_FPS_LEVELS', '2:640,1:640,1:480,0.5:320').split(","))
+]
+PROCTOR_TARGET_LATENCY_MS = float(os.getenv('PROCTOR_TARGET_LATENCY_MS', '400'))
+PROCTOR_CONTROL_WINDOW = int(os.getenv('PROCTOR_CONTROL_WINDOW', '10'))
+
+
+class LatestFrameSlot:
+    """Holds only the newest unprocessed frame of a socket; older ones are dropped."""
+
+    def __init__(self):
+        self.message = None
+        self.received_at = None
+        self.closed_code = None
+        self.event = asyncio.Event()
+        self.received = 0
+        self.dropped = 0
+
+    def put(self, message):
+        if self.message is not None:
+            self.dropped += 1
+        self.message = message
+        self.received_at = time.perf_counter()
+        self.received += 1
+        self.event.set()
+
+    def close(self, code=1000):
+        self.closed_code = code
+        self.event.set()
+
+    async def get(self):
+        """Waits for the newest frame; raises WebSocketDisconnect once the socket is closed."""
+        while True:
+            if self.closed_code is not None:
+                raise WebSocketDisconnect(self.closed_code)
+            if self.message is not None:
+                message, self.message = self.message, None
+                return message, self.received_at
+            self.event.clear()
+            await self.event.wait()
+
+
+async def receive_frames(websocket, slot):
+    """Drains the socket as fast as frames arrive so they never back up in its buffer."""
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                slot.close(message.get("code", 1000))
+                return
+            slot.put(message)
+    except Exception:
+        slot.close(1011)
+
+
+class FrameRateController:
+    """Steps a client's capture rate down when frames back up and up again when there is headroom."""
+
+    def __init__(self, initial_fps=1.0, levels=PROCTOR_FPS_LEVELS, target_latency_ms=PROCTOR_TARGET_LATENCY_MS, window=PROCTOR_CONTROL_WINDOW):
+        self.levels = levels
+        self.target_latency_ms = target_latency_ms
+        self.window = max(1, window)
+        # Start at the client's own rate and only step up once there is headroom
+        self.level = next((i for i, (fps, _) in enumerate(levels) if fps <= initial_fps), len(levels) - 1)
+        self.latency_ewma = None
+        self.window_frames = 0
+        self.window_dropped = 0
+
+    def current(self):
+        fps, max_width = self.levels[self.level]
+        return {"type": "control", "fps": fps, "max_width": max_width}
+
+    def observe(self, latency_ms, dropped):
+        """Feeds one processed frame; returns a control message when the level changes."""
+        self.latency_ewma = latency_ms if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency_ms
+        self.window_frames += 1
+        self.window_dropped += dropped
+        if self.window_frames < self.window:
+            return None
+
+        drop_ratio = self.window_dropped / (self.window_frames + self.window_dropped)
+        self.window_frames = 0
+        self.window_dropped = 0
+
+        # Falling behind means a frame takes longer than the capture interval
+        fps, _ = self.levels[self.level]
+        budget_ms = min(self.target_latency_ms, 1000 / fps)
+        level = self.level
+        if self.latency_ewma > budget_ms or drop_ratio > 0.2:
+            level = min(self.level + 1, len(self.levels) - 1)
+        elif self.latency_ewma < budget_ms / 2 and drop_ratio == 0:
+            level = max(self.level - 1, 0)
+
+        if level == self.level:
+            return None
+        self.level = level
+        return self.current()
@@ -0,0 +1,129 @@
+import json
+import struct
+import base64
+import numpy as np
+
+# Binary proctoring messages are laid out as
+#   4-byte big-endian header length | UTF-8 JSON header | optional raw image bytes
+# so annotated frames travel as plain JPEG bytes instead of base64 text.
+HEADER_LENGTH = struct.Struct(">I")
+
+PROTOCOL_JSON = "json"
+PROTOCOL_BINARY = "binary"
+SUPPORTED_PROTOCOLS = (PROTOCOL_JSON, PROTOCOL_BINARY)
+
+# ?annotate=... controls when the annotated frame is echoed back
+ANNOTATE_ALWAYS = "always"          # full-size annotated frame on every result (legacy)
+ANNOTATE_VIOLATIONS = "violations"  # thumbnail only on frames with a detected violation
+ANNOTATE_NONE = "none"              # flags and honesty score only
+ANNOTATE_MODES = (ANNOTATE_ALWAYS, ANNOTATE_VIOLATIONS, ANNOTATE_NONE)
+
+
+def negotiate_protocol(websocket):
+    """Returns the protocol requested with ?protocol=..., defaulting to the legacy JSON mode."""
+    protocol = websocket.query_params.get("protocol", PROTOCOL_JSON).lower()
+    return protocol if protocol in SUPPORTED_PROTOCOLS else PROTOCOL_JSON
+
+
+def negotiate_annotation(websocket):
+    """Returns the annotation mode requested with ?annotate=..., defaulting to every frame."""
+    mode = websocket.query_params.get("annotate", ANNOTATE_ALWAYS).lower()
+    return mode if mode in ANNOTATE_MODES else ANNOTATE_ALWAYS
+
+
+def negotiate_adaptive(websocket):
+    """True when the client accepts control messages that adjust its capture rate (?adaptive=true)."""
+    return websocket.query_params.get("adaptive", "false").lower() in ("1", "true", "yes")
+
+
+def parse_client_fps(websocket, default=1.0):
+    """The capture rate the client starts at (?fps=), so adaptive control begins from it."""
+    try:
+        fps = float(websocket.query_params.get("fps", default))
+    except ValueError:
+        return default
+    return fps if fps > 0 else default
+
+
+def frame_bytes(message):
+    """Extracts the encoded image from a websocket message (raw bytes or base64 text)."""
+    if message.get("bytes") is not None:
+        return message["bytes"]
+    return base64.b64decode(message["text"])
+
+
+def pack_message(header, payload=None):
+    """Packs a JSON header and an optional binary payload into one websocket frame."""
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    parts = [HEADER_LENGTH.pack(len(header_bytes)), header_bytes]
+    if payload is not None:
+        parts.append(payload)
+    return b"".join(parts)
+
+
+def unpack_message(message):
+    """Inverse of pack_message: returns (header, payload or None)."""
+    view = memoryview(message)
+    (header_length,) = HEADER_LENGTH.unpack_from(view)
+    header_end = HEADER_LENGTH.size + header_length
+    header = json.loads(bytes(view[HEADER_LENGTH.size:header_end]).decode("utf-8"))
+    payload = bytes(view[header_end:]) if len(view) > header_end else None
+    return header, payload
+
+
+# Stream transport (inference server Unix socket): every message is prefixed
+# with its total length so it can be read off a byte stream.
+def send_framed(sock, header, payload=None):
+    message = pack_message(header, payload)
+    sock.sendall(HEADER_LENGTH.pack(len(message)))
+    sock.sendall(message)
+
+
+def recv_exactly(sock, size):
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            raise ConnectionError("Inference server closed the connection")
+        received += count
+    return buffer
+
+
+def recv_framed(sock):
+    (size,) = HEADER_LENGTH.unpack(recv_exactly(sock, HEADER_LENGTH.size))
+    return unpack_message(recv_exactly(sock, size))
+
+
+async def read_framed(reader):
+    (size,) = HEADER_LENGTH.unpack(await reader.readexactly(HEADER_LENGTH.size))
+    return unpack_message(await reader.readexactly(size))
+
+
+async def write_framed(writer, header, payload=None):
+    message = pack_message(header, payload)
+    writer.write(HEADER_LENGTH.pack(len(message)))
+    writer.write(message)
+    await writer.drain()
+
+
+def pack_arrays(arrays):
+    """Serializes numpy arrays as (metadata for the header, concatenated raw bytes)."""
+    arrays = [np.ascontiguousarray(array) for array in arrays]
+    meta = [{"shape": list(array.shape), "dtype": str(array.dtype)} for array in arrays]
+    return meta, b"".join(arrays)
+
+
+def unpack_arrays(meta, payload):
+    arrays = []
+    offset = 0
+    for spec in meta:
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"]))
+        if count == 0:
+            arrays.append(np.empty(spec["shape"], dtype=dtype))
+            continue
+        arrays.append(np.frombuffer(payload, dtype=dtype, count=count, offset=offset).reshape(spec["shape"]))
+        offset += count * dtype.itemsize
+    return arrays
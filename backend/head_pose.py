@@ -0,0 +1,99 @@
+import math
+import os
+from functools import lru_cache
+import cv2
+import numpy as np
+
+# Configuration
+# Seed solvePnP with the previous frame's pose (SOLVEPNP_ITERATIVE + extrinsic guess)
+PROCTOR_HEAD_POSE_TRACKING = os.getenv('PROCTOR_HEAD_POSE_TRACKING', 'true').lower() == 'true'
+PROCTOR_FACE_AWAY_YAW_DEGREES = float(os.getenv('PROCTOR_FACE_AWAY_YAW_DEGREES', '20'))
+
+# FaceMesh landmarks used for the pose fit
+LANDMARK_INDICES = (
+    1,    # Nose tip
+    33,   # Left eye
+    263,  # Right eye
+    61,   # Left mouth corner
+    291,  # Right mouth corner
+    199,  # Left eyebrow
+    419,  # Right eyebrow
+    4,    # Nose bridge
+    152   # Chin
+)
+
+MODEL_POINTS = np.array([
+    [0.0, 0.0, 0.0], [-30.0, -30.0, -30.0], [30.0, -30.0, -30.0],
+    [-30.0, 30.0, -30.0], [30.0, 30.0, -30.0], [-30.0, -40.0, -30.0],
+    [30.0, -40.0, -30.0], [0.0, -10.0, -30.0], [0.0, 40.0, -30.0]
+], dtype=np.float64)
+
+
+@lru_cache(maxsize=16)
+def camera_matrix(w, h):
+    """Pinhole intrinsics (focal length = width, centered principal point), built once per resolution."""
+    matrix = np.array([
+        [w, 0, w / 2],
+        [0, w, h / 2],
+        [0, 0, 1]
+    ], dtype=np.float64)
+    matrix.setflags(write=False)
+    return matrix
+
+
+def landmark_points(landmarks, w, h):
+    """Pixel coordinates of the pose landmarks as a (9, 2) array."""
+    points = np.fromiter(
+        (value for i in LANDMARK_INDICES for value in (landmarks[i].x, landmarks[i].y)),
+        dtype=np.float64, count=2 * len(LANDMARK_INDICES)
+    ).reshape(-1, 2)
+    points *= (w, h)
+    return points
+
+
+def yaw_from_rotation_vector(rotation_vector):
+    """Absolute yaw in degrees, read straight off the rotation vector.
+
+    Same angle decomposeProjectionMatrix reports for the y axis, but only the
+    R[2, 0] element of the Rodrigues matrix is computed.
+    """
+    rx, ry, rz = rotation_vector.ravel()
+    theta = math.sqrt(rx * rx + ry * ry + rz * rz)
+    if theta < 1e-9:
+        return 0.0
+    kx, ky, kz = rx / theta, ry / theta, rz / theta
+    r20 = (1 - math.cos(theta)) * kz * kx - math.sin(theta) * ky
+    return math.degrees(math.asin(min(1.0, abs(r20))))
+
+
+class HeadPoseEstimator:
+    """Per-session head-pose fit that starts each solve from the previous frame's pose."""
+
+    def __init__(self, tracking=PROCTOR_HEAD_POSE_TRACKING):
+        self.tracking = tracking
+        self.rotation_vector = None
+        self.translation_vector = None
+
+    def reset(self):
+        self.rotation_vector = None
+        self.translation_vector = None
+
+    def estimate_yaw(self, landmarks, w, h):
+        """Absolute head yaw in degrees, or None when the fit fails."""
+        image_points = landmark_points(landmarks, w, h)
+        if self.tracking and self.rotation_vector is not None:
+            success, rotation_vector, translation_vector = cv2.solvePnP(
+                MODEL_POINTS, image_points, camera_matrix(w, h), None,
+                self.rotation_vector, self.translation_vector,
+                useExtrinsicGuess=True, flags=cv2.SOLVEPNP_ITERATIVE
+            )
+        else:
+            success, rotation_vector, translation_vector = cv2.solvePnP(
+                MODEL_POINTS, image_points, camera_matrix(w, h), None, flags=cv2.SOLVEPNP_ITERATIVE
+            )
+        if not success:
+            self.reset()
+            return None
+        if self.tracking:
+            self.rotation_vector, self.translation_vector = rotation_vector, translation_vector
+        return yaw_from_rotation_vector(rotation_vector)
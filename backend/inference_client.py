@@ -0,0 +1,122 @@
+import logging
+import os
+import socket
+import threading
+import time
+import numpy as np
+from frame_protocol import send_framed, recv_framed, pack_arrays, unpack_arrays
+from app_logging import get_logger, LogSampler
+
+logger = get_logger(__name__)
+failure_log = LogSampler()
+
+# Configuration
+# When set, models are served by inference_server.py on this Unix socket instead of being loaded in-process
+INFERENCE_SERVER_SOCKET = os.getenv('INFERENCE_SERVER_SOCKET')
+INFERENCE_SERVER_TIMEOUT = float(os.getenv('INFERENCE_SERVER_TIMEOUT', '600'))
+# Phone detection is on the live proctoring path: give up quickly and report no phones instead
+INFERENCE_PHONE_TIMEOUT = float(os.getenv('INFERENCE_PHONE_TIMEOUT', '1.5'))
+# After a failed detection call the server is not asked again for this long
+INFERENCE_PHONE_RETRY_SECONDS = float(os.getenv('INFERENCE_PHONE_RETRY_SECONDS', '5'))
+
+
+class InferenceClient:
+    """Thin client for the shared inference server.
+
+    Each calling thread keeps its own connection, so concurrent callers never
+    interleave requests on one stream.
+    """
+
+    def __init__(self, socket_path=INFERENCE_SERVER_SOCKET, timeout=INFERENCE_SERVER_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def _connection(self, timeout):
+        sock = getattr(self.local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(timeout)
+            sock.connect(self.socket_path)
+            self.local.sock = sock
+        sock.settimeout(timeout)
+        return sock
+
+    def _reset(self):
+        sock = getattr(self.local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self.local.sock = None
+
+    def call(self, header, payload=None, timeout=None):
+        try:
+            sock = self._connection(timeout or self.timeout)
+            send_framed(sock, header, payload)
+            response, response_payload = recv_framed(sock)
+        except (OSError, ConnectionError):
+            # Drop the broken (or timed-out, so out of step) stream; the next call reconnects
+            self._reset()
+            raise
+        if "error" in response:
+            raise RuntimeError(f"Inference server error in {header['method']}: {response['error']}")
+        return response, response_payload
+
+    def detect_phones(self, frames, timeout=INFERENCE_PHONE_TIMEOUT):
+        meta, payload = pack_arrays(frames)
+        response, response_payload = self.call({"method": "detect_phones", "arrays": meta}, payload, timeout=timeout)
+        return unpack_arrays(response["arrays"], response_payload)
+
+    def transcribe(self, audio):
+        """Transcribes 16 kHz mono float32 PCM (sent inline) or a media file path."""
+        if isinstance(audio, np.ndarray):
+            meta, payload = pack_arrays([audio])
+            response, _ = self.call({"method": "transcribe", "arrays": meta}, payload)
+        else:
+            response, _ = self.call({"method": "transcribe", "path": os.path.abspath(str(audio))})
+        return response["result"]
+
+    def sentiment(self, texts):
+        response, _ = self.call({"method": "sentiment", "texts": texts})
+        return response["result"]
+
+    def emotions(self, frames):
+        meta, payload = pack_arrays(frames)
+        response, _ = self.call({"method": "emotions", "arrays": meta}, payload)
+        return response["result"]
+
+    def health(self):
+        response, _ = self.call({"method": "health"})
+        return response["result"]
+
+
+def no_detections(frames):
+    return [np.empty((0, 6), dtype=np.float32) for _ in frames]
+
+
+class RemotePhoneDetector:
+    """Drop-in for PhoneDetector that runs detection on the inference server.
+
+    A slow or unreachable server must not stall every live session behind the
+    batch, so a failed call reports no phones and the server is skipped for
+    INFERENCE_PHONE_RETRY_SECONDS.
+    """
+
+    def __init__(self, client=None, retry_seconds=INFERENCE_PHONE_RETRY_SECONDS):
+        self.client = client or InferenceClient()
+        self.retry_seconds = retry_seconds
+        self.retry_at = 0.0
+        self.failures = 0
+
+    def detect(self, frames):
+        if time.monotonic() < self.retry_at:
+            return no_detections(frames)
+        try:
+            return self.client.detect_phones(frames)
+        except (OSError, ConnectionError, RuntimeError) as e:
+            self.failures += 1
+            self.retry_at = time.monotonic() + self.retry_seconds
+            failure_log.log(logger, logging.WARNING, "detect_phones", "Remote phone detection failed, reporting no phones: %s", e, failures=self.failures)
+            return no_detections(frames)
+
+    def describe(self):
+        return {"backend": "inference-server", "socket": self.client.socket_path, "timeout": INFERENCE_PHONE_TIMEOUT, "failures": self.failures}
@@ -0,0 +1,85 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Configuration
+PROCTOR_MAX_BATCH_SIZE = int(os.getenv('PROCTOR_MAX_BATCH_SIZE', '8'))
+PROCTOR_MAX_BATCH_WAIT_MS = float(os.getenv('PROCTOR_MAX_BATCH_WAIT_MS', '25'))
+
+
+class InferenceScheduler:
+    """Micro-batches frames submitted by all live proctoring sessions.
+
+    Frames are collected for up to `max_wait_ms` (or until `max_batch_size`
+    frames are waiting), run through `predict_batch` in one call and the
+    per-frame results are handed back to the awaiting sockets.
+    """
+
+    def __init__(self, predict_batch, max_batch_size=PROCTOR_MAX_BATCH_SIZE, max_wait_ms=PROCTOR_MAX_BATCH_WAIT_MS):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        # Batched inference is serialized on a single thread; the model itself
+        # fans out over the intra-op thread pool.
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference-batch")
+        self.queue = None
+        self.worker = None
+        self.batches_run = 0
+        self.frames_run = 0
+
+    def _ensure_worker(self):
+        if self.worker is None or self.worker.done():
+            self.queue = asyncio.Queue()
+            self.worker = asyncio.create_task(self._run())
+
+    async def submit(self, frame):
+        """Queue a frame for the next batch and wait for its result."""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((frame, future))
+        return await future
+
+    async def _collect_batch(self):
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        # Drop requests whose socket went away while waiting
+        return [(frame, future) for frame, future in batch if not future.cancelled()]
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+            if not batch:
+                continue
+
+            frames = [frame for frame, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, self.predict_batch, frames)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches_run += 1
+            self.frames_run += len(frames)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self):
+        return {
+            "batches": self.batches_run,
+            "frames": self.frames_run,
+            "avg_batch_size": round(self.frames_run / self.batches_run, 2) if self.batches_run else 0,
+            "queued": self.queue.qsize() if self.queue else 0
+        }
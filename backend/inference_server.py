@@ -0,0 +1,157 @@
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from frame_protocol import read_framed, write_framed, pack_arrays, unpack_arrays
+from inference_scheduler import InferenceScheduler
+from facial_emotion import classify_emotions
+from audio_decoder import decode_audio
+
+# Usage:
+#   python inference_server.py --socket /tmp/hiro-inference.sock
+#   INFERENCE_SERVER_SOCKET=/tmp/hiro-inference.sock uvicorn main:app --workers 4
+#
+# Hosts the heavy models once per node; API workers talk to it over a Unix
+# socket through inference_client.InferenceClient.
+
+INFERENCE_MODELS = ("phone", "transcription", "sentiment", "emotion")
+
+
+class InferenceServer:
+    def __init__(self, models):
+        self.models = set(models)
+        self.started_at = time.time()
+        self.requests = 0
+        # Audio/video models are slow and not re-entrant; one thread each
+        self.audio_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference-audio")
+        self.video_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference-video")
+        self.phone_scheduler = None
+        self.transcriber = None
+        self.sentiment_pipeline = None
+        self.emotion_model = None
+
+        if "phone" in self.models:
+            from phone_detector import PhoneDetector
+            phone_detector = PhoneDetector()
+            # Frames from every API worker are batched together here
+            self.phone_scheduler = InferenceScheduler(phone_detector.detect)
+            print(f"Loaded phone detector: {phone_detector.describe()}")
+
+        if "transcription" in self.models or "sentiment" in self.models:
+            import torch
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            if "transcription" in self.models:
+                from transcription import create_transcriber
+                self.transcriber = create_transcriber()
+                print(f"Loaded transcriber: {self.transcriber.describe()}")
+            if "sentiment" in self.models:
+                from transformers import pipeline
+                self.sentiment_pipeline = pipeline("sentiment-analysis", device=0 if device == "cuda" else -1)
+                print("Loaded sentiment pipeline")
+
+        if "emotion" in self.models:
+            from facial_emotion import load_emotion_model
+            self.emotion_model = load_emotion_model()
+            print("Loaded emotion model")
+
+    def _require(self, model):
+        if model not in self.models:
+            raise ValueError(f"Model '{model}' is not hosted by this inference server")
+
+    async def detect_phones(self, header, payload):
+        self._require("phone")
+        frames = unpack_arrays(header["arrays"], payload)
+        detections = await asyncio.gather(*(self.phone_scheduler.submit(frame) for frame in frames))
+        meta, result_payload = pack_arrays(detections)
+        return {"arrays": meta}, result_payload
+
+    def _transcribe(self, audio):
+        if not isinstance(audio, np.ndarray):
+            audio = decode_audio(audio)
+        result = self.transcriber.transcribe(audio)
+        return {
+            "text": result["text"],
+            "language": result.get("language"),
+            "segments": [
+                {"start": segment["start"], "end": segment["end"], "text": segment["text"]}
+                for segment in result.get("segments", [])
+            ]
+        }
+
+    def _sentiment(self, texts):
+        return [dict(result) for result in self.sentiment_pipeline(texts, batch_size=len(texts), truncation=True)]
+
+    def _emotions(self, frames):
+        return [{"dominant_emotion": emotion} for emotion in classify_emotions(self.emotion_model, frames)]
+
+    async def dispatch(self, header, payload):
+        loop = asyncio.get_running_loop()
+        method = header.get("method")
+        if method == "detect_phones":
+            return await self.detect_phones(header, payload)
+        if method == "transcribe":
+            self._require("transcription")
+            audio = unpack_arrays(header["arrays"], payload)[0] if "arrays" in header else header["path"]
+            return {"result": await loop.run_in_executor(self.audio_executor, self._transcribe, audio)}, None
+        if method == "sentiment":
+            self._require("sentiment")
+            return {"result": await loop.run_in_executor(self.audio_executor, self._sentiment, header["texts"])}, None
+        if method == "emotions":
+            self._require("emotion")
+            frames = unpack_arrays(header["arrays"], payload)
+            return {"result": await loop.run_in_executor(self.video_executor, self._emotions, frames)}, None
+        if method == "health":
+            return {"result": {
+                "models": sorted(self.models),
+                "uptime_seconds": round(time.time() - self.started_at, 1),
+                "requests": self.requests,
+                "phone_batching": self.phone_scheduler.stats() if self.phone_scheduler else None
+            }}, None
+        raise ValueError(f"Unknown method '{method}'")
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    header, payload = await read_framed(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                self.requests += 1
+                try:
+                    response, response_payload = await self.dispatch(header, payload)
+                except Exception as e:
+                    print(f"Inference request {header.get('method')} failed: {e}")
+                    response, response_payload = {"error": str(e)}, None
+                await write_framed(writer, response, response_payload)
+        finally:
+            writer.close()
+
+
+async def serve(socket_path, models):
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    server = InferenceServer(models)
+    unix_server = await asyncio.start_unix_server(server.handle_connection, path=socket_path)
+    print(f"Inference server listening on {socket_path} with models: {', '.join(sorted(server.models))}")
+    async with unix_server:
+        await unix_server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared model server for the API workers")
+    parser.add_argument("--socket", default=os.getenv('INFERENCE_SERVER_SOCKET', '/tmp/hiro-inference.sock'))
+    parser.add_argument("--models", default=",".join(INFERENCE_MODELS),
+                        help=f"Comma-separated models to host ({', '.join(INFERENCE_MODELS)})")
+    args = parser.parse_args()
+
+    models = [model.strip() for model in args.models.split(",") if model.strip()]
+    unknown = set(models) - set(INFERENCE_MODELS)
+    if unknown:
+        parser.error(f"Unknown models: {', '.join(sorted(unknown))}")
+    asyncio.run(serve(args.socket, models))
+
+
+if __name__ == "__main__":
+    main()
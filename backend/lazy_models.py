@@ -0,0 +1,61 @@
+import threading
+import time
+
+# Every LazyModel registers itself here so warm-up and readiness can see them
+registry = {}
+
+
+class LazyModel:
+    """Loads a model on first use instead of at import time.
+
+    Loading is guarded by a lock so concurrent first requests load it once;
+    the load time is kept for the startup report.
+    """
+
+    def __init__(self, name, loader, role):
+        self.name = name
+        self.loader = loader
+        self.role = role
+        self.lock = threading.Lock()
+        self.instance = None
+        self.load_ms = None
+        self.error = None
+        registry[name] = self
+
+    @property
+    def loaded(self):
+        return self.instance is not None
+
+    def get(self):
+        if self.instance is None:
+            with self.lock:
+                if self.instance is None:
+                    start = time.perf_counter()
+                    try:
+                        self.instance = self.loader()
+                        self.error = None
+                    except Exception as e:
+                        self.error = str(e)
+                        raise
+                    finally:
+                        self.load_ms = round((time.perf_counter() - start) * 1000, 1)
+                    print(f"Loaded model {self.name} in {self.load_ms} ms")
+        return self.instance
+
+    def status(self):
+        return {"role": self.role, "loaded": self.loaded, "load_ms": self.load_ms, "error": self.error}
+
+
+def warm_up(roles=None):
+    """Loads every registered model (optionally only those of the given roles); returns their status."""
+    for model in list(registry.values()):
+        if roles is None or model.role in roles:
+            try:
+                model.get()
+            except Exception as e:
+                print(f"Warm-up failed for {model.name}: {e}")
+    return model_status()
+
+
+def model_status():
+    return {name: model.status() for name, model in registry.items()}
@@ -2,7 +2,6 @@ import requests
 import openai
 from openai import OpenAI, RateLimitError, APIError, APIConnectionError
 import time
-import praw
 import os
 import json
 from dotenv import load_dotenv
@@ -15,10 +14,16 @@ from fastapi import BackgroundTasks
 from bs4 import BeautifulSoup
 from urllib.parse import quote_plus
 import re
+import logging
+from app_logging import get_logger, LogSampler
 
 # Load environment variables
 load_dotenv()
 
+logger = get_logger(__name__)
+# Per-call and per-lead lines are sampled per message type so a long scrape does not flood the log
+lead_log = LogSampler()
+
 # Configuration
 USE_LOCAL_MODEL = os.getenv('USE_LOCAL_MODEL', 'true').lower() == 'true'
 OLLAMA_BASE_URL = os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
@@ -32,16 +37,22 @@ PHANTOMBUSTER_PHANTOM_ID = os.getenv("PHANTOMBUSTER_PHANTOM_ID")
 HUNTER_API_KEY = os.getenv("HUNTER_API_KEY")
 SERPAPI_KEY = os.getenv("SERPAPI_KEY")  # Add SerpAPI key
 
-# Initialize Reddit client
-try:
-    reddit = praw.Reddit(
-        client_id=REDDIT_CLIENT_ID,
-        client_secret=REDDIT_CLIENT_SECRET,
-        user_agent=REDDIT_USER_AGENT
-    )
-except Exception as e:
-    print(f"⚠️ Warning: Failed to initialize Reddit client: {str(e)}")
-    reddit = None
+# Reddit client, created on first use so importing this module stays cheap
+reddit = None
+
+def get_reddit_client():
+    global reddit
+    if reddit is None:
+        try:
+            import praw
+            reddit = praw.Reddit(
+                client_id=REDDIT_CLIENT_ID,
+                client_secret=REDDIT_CLIENT_SECRET,
+                user_agent=REDDIT_USER_AGENT
+            )
+        except Exception as e:
+            logger.warning("Warning: Failed to initialize Reddit client: %s", e)
+    return reddit
 
 # Initialize OpenAI client if needed
 openai_client = None
@@ -49,7 +60,7 @@ if not USE_LOCAL_MODEL and OPENAI_API_KEY:
     try:
         openai_client = OpenAI(api_key=OPENAI_API_KEY)
     except Exception as e:
-        print(f"⚠️ Warning: Failed to initialize OpenAI client: {str(e)}")
+        logger.warning("Warning: Failed to initialize OpenAI client: %s", e)
 
 def check_ollama_status():
     """Check if Ollama server is running and model is available."""
@@ -60,24 +71,24 @@ def check_ollama_status():
             for model in models:
                 if model.get('name') == OLLAMA_MODEL:
                     return True
-            print(f"⚠️ Model {OLLAMA_MODEL} not found. Available models: {[m.get('name') for m in models]}")
+            logger.warning("Model %s not found. Available models: %s", OLLAMA_MODEL, [m.get('name') for m in models])
             return False
     except requests.exceptions.ConnectionError:
-        print("⚠️ Ollama server is not running. Please start it with 'ollama serve'")
+        logger.warning("Ollama server is not running. Please start it with 'ollama serve'")
         return False
     except Exception as e:
-        print(f"⚠️ Error checking Ollama status: {str(e)}")
+        logger.error("Error checking Ollama status: %s", e)
         return False
     return False
 
 def call_ollama(prompt: str, model: str = OLLAMA_MODEL) -> str:
     """Make an API call to local Ollama instance."""
     if not check_ollama_status():
-        print("⚠️ Falling back to OpenAI (if configured)")
+        logger.warning("Falling back to OpenAI (if configured)")
         return ""
         
     try:
-        print(f"🚀 Calling Ollama with model: {model}")
+        lead_log.log(logger, logging.DEBUG, "ollama_call", "Calling Ollama with model: %s", model)
         response = requests.post(
             f"{OLLAMA_BASE_URL}/api/generate",
             json={
@@ -89,10 +100,10 @@ def call_ollama(prompt: str, model: str = OLLAMA_MODEL) -> str:
         )
         response.raise_for_status()
         result = response.json().get('response', '').strip()
-        print(f"✅ Ollama response received, length: {len(result)} chars")
+        lead_log.log(logger, logging.INFO, "ollama_response", "Ollama response received, length: %s chars", len(result))
         return result
     except requests.exceptions.RequestException as e:
-        print(f"⚠️ Ollama API error: {str(e)}")
+        logger.error("Ollama API error: %s", e)
         return ""
 
 def safe_gpt_call(prompt: str, max_retries=3, delay=5):
@@ -103,7 +114,7 @@ def safe_gpt_call(prompt: str, max_retries=3, delay=5):
             try:
                 return call_ollama(prompt)
             except Exception as e:
-                print(f"⚠️ Local model error (Attempt {attempt + 1}/{max_retries}): {str(e)}")
+                logger.error("Local model error (Attempt %s/%s): %s", attempt + 1, max_retries, e)
                 if attempt < max_retries - 1:
                     time.sleep(delay)
                     delay *= 2
@@ -111,7 +122,7 @@ def safe_gpt_call(prompt: str, max_retries=3, delay=5):
     else:
         # Use OpenAI
         if not openai_client:
-            print("⚠️ OpenAI client not initialized")
+            logger.warning("OpenAI client not initialized")
             return ""
             
         for attempt in range(max_retries):
@@ -124,29 +135,29 @@ def safe_gpt_call(prompt: str, max_retries=3, delay=5):
                 )
                 return response.choices[0].message.content.strip()
             except RateLimitError:
-                print(f"🔁 Rate limit hit. Retrying in {delay} seconds... (Attempt {attempt + 1}/{max_retries})")
+                logger.warning("Rate limit hit. Retrying in %s seconds... (Attempt %s/%s)", delay, attempt + 1, max_retries)
                 if attempt < max_retries - 1:
                     time.sleep(delay)
                     delay *= 2
             except APIConnectionError:
-                print(f"🔌 Connection error. Retrying in {delay} seconds... (Attempt {attempt + 1}/{max_retries})")
+                logger.warning("Connection error. Retrying in %s seconds... (Attempt %s/%s)", delay, attempt + 1, max_retries)
                 if attempt < max_retries - 1:
                     time.sleep(delay)
                     delay *= 2
             except APIError as e:
-                print(f"⚠️ OpenAI API error: {str(e)}")
+                logger.error("OpenAI API error: %s", e)
                 if attempt < max_retries - 1:
                     time.sleep(delay)
                     delay *= 2
                 continue
             except Exception as e:
-                print(f"⚠️ Unexpected error in GPT call: {str(e)}")
+                logger.error("Unexpected error in GPT call: %s", e)
                 break
         return ""
 
 def predict_subreddits(job_title: str, skills: List[str], location: str) -> List[str]:
     """Predict relevant subreddits for a job based on title, skills, and location."""
-    print("\n🔍 Predicting subreddits...")
+    logger.info("Predicting subreddits...")
     prompt = f"""
 You are a helpful assistant that suggests relevant subreddits for job searching. I need exactly 5 subreddits for this position:
 
@@ -163,12 +174,12 @@ r/subreddit5
 
 DO NOT include any other text, bullets, or formatting. ONLY return the subreddit names, one per line, starting with r/.
 """
-    print(f"📝 Using prompt:\n{prompt}")
+    logger.debug("Using prompt:\n%s", prompt)
     text = safe_gpt_call(prompt, max_retries=3, delay=5)
-    print(f"🤖 Model response:\n{text}")
+    logger.debug("Model response:\n%s", text)
     
     if not text:
-        print("⚠️ Failed to predict subreddits - no response from model")
+        logger.warning("Failed to predict subreddits - no response from model")
         return []
     
     # Extract subreddits from both r/ format and bullet points with r/
@@ -185,7 +196,7 @@ DO NOT include any other text, bullets, or formatting. ONLY return the subreddit
             if subreddit:
                 subreddits.append(subreddit)
     
-    print(f"📋 Extracted subreddits: {subreddits}")
+    logger.debug("Extracted subreddits: %s", subreddits)
     
     # If no subreddits found, provide some default ones based on job title
     if not subreddits:
@@ -196,7 +207,7 @@ DO NOT include any other text, bullets, or formatting. ONLY return the subreddit
             'r/jobs',
             'r/hiring'
         ]
-        print(f"⚠️ No subreddits extracted, using defaults: {defaults}")
+        logger.warning("No subreddits extracted, using defaults: %s", defaults)
         return defaults
         
     return subreddits
@@ -236,6 +247,7 @@ def scrape_subreddit_posts(subreddit: str, keywords: List[str], limit: int = 5)
     """Scrape recent posts from a subreddit using multiple keywords."""
     try:
         # Get subreddit instance
+        reddit = get_reddit_client()
         sub = reddit.subreddit(subreddit.replace('r/', ''))
         search_query = ' OR '.join(['open to work'] + keywords)
         
@@ -250,7 +262,7 @@ def scrape_subreddit_posts(subreddit: str, keywords: List[str], limit: int = 5)
                     if hasattr(author, 'description'):
                         author_description = author.description or ""
             except Exception as e:
-                print(f"⚠️ Could not fetch author details: {str(e)}")
+                logger.warning("Could not fetch author details: %s", e)
 
             # Combine post content with author description for better contact info extraction
             full_content = f"{post.title}\n{post.selftext}\n{author_description}"
@@ -271,7 +283,7 @@ def scrape_subreddit_posts(subreddit: str, keywords: List[str], limit: int = 5)
             
         return results
     except Exception as e:
-        print(f"⚠️ Error scraping {subreddit}: {str(e)}")
+        logger.error("Error scraping %s: %s", subreddit, e)
         return []
 
 def extract_skills_and_location(post_text: str) -> Dict:
@@ -354,7 +366,7 @@ def store_lead(db: Session, lead_data: Dict):
                 existing_lead.updated_at = datetime.utcnow()
                 db.commit()
                 db.refresh(existing_lead)
-                print(f"✅ Updated existing lead for username: {lead_data['author']}")
+                lead_log.log(logger, logging.INFO, "lead_updated", "Updated existing lead for username: %s", lead_data['author'])
                 return existing_lead
 
         # Generate a unique email if none provided
@@ -383,11 +395,11 @@ def store_lead(db: Session, lead_data: Dict):
         db.add(lead)
         db.commit()
         db.refresh(lead)
-        print(f"✅ Created new lead for {lead_data['author']}")
+        lead_log.log(logger, logging.INFO, "lead_created", "Created new lead for %s", lead_data['author'])
         return lead
     except Exception as e:
         db.rollback()
-        print(f"⚠️ Error storing lead: {str(e)}")
+        logger.error("Error storing lead: %s", e)
         return None
 
 # --- LinkedIn Sourcing Functions ---
@@ -397,13 +409,13 @@ def get_linkedin_profiles(job_title: str, location: str, max_results=20) -> list
     profiles = []
     try:
         if not SERPAPI_KEY:
-            print("⚠️ SerpAPI key not configured")
+            logger.warning("SerpAPI key not configured")
             return profiles
             
         # Construct search query
         search_query = f'site:linkedin.com/in/ "{job_title}" "{location}"'
         
-        print(f"🔍 Searching for LinkedIn profiles using SerpAPI: {search_query}")
+        logger.info("Searching for LinkedIn profiles using SerpAPI: %s", search_query)
         
         # Make request to SerpAPI
         params = {
@@ -428,20 +440,20 @@ def get_linkedin_profiles(job_title: str, location: str, max_results=20) -> list
                     break
                     
             except requests.RequestException as e:
-                print(f"⚠️ SerpAPI request failed (attempt {attempt + 1}/{max_retries}): {str(e)}")
+                logger.warning("SerpAPI request failed (attempt %s/%s): %s", attempt + 1, max_retries, e)
                 if attempt < max_retries - 1:
                     time.sleep(retry_delay)
                     retry_delay *= 2
                 continue
                 
         if response.status_code != 200:
-            print(f"⚠️ Failed to get search results after {max_retries} attempts")
+            logger.warning("Failed to get search results after %s attempts", max_retries)
             return profiles
             
         data = response.json()
         organic_results = data.get('organic_results', [])
         
-        print(f"📊 Found {len(organic_results)} search results")
+        logger.info("Found %s search results", len(organic_results))
         
         for result in organic_results:
             try:
@@ -486,7 +498,7 @@ def get_linkedin_profiles(job_title: str, location: str, max_results=20) -> list
                     'linkedinUrl': link
                 }
                 
-                print(f"✅ Found profile: {name} - {headline}")
+                lead_log.log(logger, logging.INFO, "linkedin_profile", "Found profile: %s - %s", name, headline)
                 profiles.append(profile_data)
                 
                 if len(profiles) >= max_results:
@@ -496,14 +508,14 @@ def get_linkedin_profiles(job_title: str, location: str, max_results=20) -> list
                 time.sleep(0.5)
                 
             except Exception as e:
-                print(f"⚠️ Error parsing result: {str(e)}")
+                logger.error("Error parsing result: %s", e)
                 continue
         
-        print(f"✅ Successfully found {len(profiles)} LinkedIn profiles")
+        logger.info("Successfully found %s LinkedIn profiles", len(profiles))
         return profiles
         
     except Exception as e:
-        print(f"⚠️ Error in SerpAPI search for LinkedIn profiles: {str(e)}")
+        logger.error("Error in SerpAPI search for LinkedIn profiles: %s", e)
         return []
 
 def analyze_linkedin_profile(profile: dict, job_title: str, required_skills: list, location: str) -> dict:
@@ -581,7 +593,7 @@ Be lenient in scoring:
         }
 
     except Exception as e:
-        print(f"⚠️ Error in score extraction: {str(e)}")
+        logger.error("Error in score extraction: %s", e)
         return {
             "profile": profile,
             "summary": "Error in analysis",
@@ -620,13 +632,13 @@ def extract_company_domain(linkedin_url: str) -> str:
         
         return None
     except Exception as e:
-        print(f"⚠️ Error extracting company domain: {str(e)}")
+        logger.error("Error extracting company domain: %s", e)
         return None
 
 def get_email_from_hunter(full_name: str, company_domain: str = None, linkedin_url: str = None) -> Dict:
     """Use Hunter.io to find email addresses."""
     if not HUNTER_API_KEY:
-        print("⚠️ Hunter.io API key not configured")
+        logger.warning("Hunter.io API key not configured")
         return {"email": "Not provided", "score": 0}
 
     try:
@@ -634,10 +646,10 @@ def get_email_from_hunter(full_name: str, company_domain: str = None, linkedin_u
         if not company_domain and linkedin_url:
             company_domain = extract_company_domain(linkedin_url)
             if company_domain:
-                print(f"🔍 Extracted company domain: {company_domain}")
+                logger.info("Extracted company domain: %s", company_domain)
 
         if not company_domain:
-            print("⚠️ No company domain available for email search")
+            logger.warning("No company domain available for email search")
             return {"email": "Not provided", "score": 0}
 
         # Clean up the full name
@@ -646,7 +658,7 @@ def get_email_from_hunter(full_name: str, company_domain: str = None, linkedin_u
         first_name = name_parts[0] if name_parts else ""
         last_name = name_parts[-1] if len(name_parts) > 1 else ""
 
-        print(f"🔍 Searching for email for: {full_name} at {company_domain}")
+        lead_log.log(logger, logging.INFO, "email_search", "Searching for email for: %s at %s", full_name, company_domain)
 
         # Try email finder first (more accurate)
         response = requests.get(
@@ -666,7 +678,7 @@ def get_email_from_hunter(full_name: str, company_domain: str = None, linkedin_u
             score = data.get('score', 0)
             
             if email and score > 0:
-                print(f"✅ Found email via email finder: {email} (score: {score})")
+                lead_log.log(logger, logging.INFO, "email_found", "Found email via email finder: %s (score: %s)", email, score)
                 return {
                     "email": email,
                     "score": score
@@ -696,17 +708,17 @@ def get_email_from_hunter(full_name: str, company_domain: str = None, linkedin_u
                     email_last_name in last_name.lower()):
                     email = email_data.get('value')
                     confidence = email_data.get('confidence', 0)
-                    print(f"✅ Found email via domain search: {email} (confidence: {confidence})")
+                    lead_log.log(logger, logging.INFO, "email_found", "Found email via domain search: %s (confidence: %s)", email, confidence)
                     return {
                         "email": email,
                         "score": confidence
                     }
 
-        print("⚠️ No email found")
+        logger.warning("No email found")
         return {"email": "Not provided", "score": 0}
 
     except Exception as e:
-        print(f"⚠️ Error in Hunter.io API call: {str(e)}")
+        logger.error("Error in Hunter.io API call: %s", e)
         return {"email": "Not provided", "score": 0}
 
 async def process_linkedin_leads(job_title: str, skills: List[str], location: str, db: Session, job_id: int, max_leads: int = 20) -> List[Dict]:
@@ -717,12 +729,11 @@ async def process_linkedin_leads(job_title: str, skills: List[str], location: st
         profiles = get_linkedin_profiles(job_title, location, max_results=max_leads)
         
         for profile in profiles:
-            print(f"\n🔍 Analyzing LinkedIn profile: {profile.get('name', 'Unknown')}")
+            lead_log.log(logger, logging.INFO, "linkedin_analysis", "Analyzing LinkedIn profile: %s", profile.get('name', 'Unknown'))
             
             # Analyze profile with Llama3
             analysis = analyze_linkedin_profile(profile, job_title, skills, location)
-            print(f"🤖 Analysis: {analysis}")
-            print(f"🤖 Score: {analysis['score']}")
+            lead_log.log(logger, logging.DEBUG, "linkedin_analysis_result", "Analysis (score %s): %s", analysis['score'], analysis)
             if analysis['score'] >= 3:  # Only process high-scoring profiles
                 # Get email using Hunter.io
                 email_info = get_email_from_hunter(
@@ -750,12 +761,12 @@ async def process_linkedin_leads(job_title: str, skills: List[str], location: st
                 stored_lead = store_lead(db, lead_data)
                 if stored_lead:
                     leads.append(lead_data)
-                    print(f"✅ Stored LinkedIn lead: {profile.get('name')} with score {analysis['score']}/10")
+                    lead_log.log(logger, logging.INFO, "linkedin_stored", "Stored LinkedIn lead: %s with score %s/10", profile.get('name'), analysis['score'])
             
             time.sleep(1)  # Rate limiting
             
     except Exception as e:
-        print(f"⚠️ Error processing LinkedIn leads: {str(e)}")
+        logger.error("Error processing LinkedIn leads: %s", e)
     
     return leads
 
@@ -782,36 +793,37 @@ async def process_reddit_leads(job_title: str, skills: List[str], location: str,
     max_leads_per_subreddit = max_leads // 5  # Divide among subreddits evenly
     
     if not all([REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET]):
-        print("⚠️ Reddit API credentials not configured")
+        logger.warning("Reddit API credentials not configured")
         return leads
 
-    print("\n🔍 Searching Reddit for candidates...")
+    logger.info("Searching Reddit for candidates...")
     try:
         relevance_threshold = 3
         subreddits = predict_subreddits(job_title, skills, location)
-        print("✅ Suggested subreddits:", subreddits)
+        logger.info("Suggested subreddits: %s", subreddits)
 
         for sub in subreddits:
             if total_leads_evaluated >= max_leads:
-                print(f"✋ Reached maximum lead limit ({max_leads})")
+                logger.info("Reached maximum lead limit (%s)", max_leads)
                 break
                 
-            print(f"\n📂 Scraping posts from {sub}...")
+            logger.info("Scraping posts from %s...", sub)
             posts = scrape_subreddit_posts(sub, skills, limit=max_leads_per_subreddit)
 
             for post in posts:
                 if total_leads_evaluated >= max_leads:
                     break
                     
-                print(f"\n📝 Analyzing Reddit post by u/{post['author']}...")
+                lead_log.log(logger, logging.INFO, "reddit_analysis", "Analyzing Reddit post by u/%s...", post['author'])
                 total_leads_evaluated += 1
                 
                 extracted_info = extract_skills_and_location(post['text'])
                 contact_info = extract_contact_info(post['full_content'])
                 analysis = summarize_post(post['text'], job_title, skills, location)
-                print(f"🤖 Analysis: {analysis}")
-                print(f"🤖 Is candidate: {analysis['is_candidate']}")
-                print(f"🤖 Score: {analysis['score']}")
+                lead_log.log(
+                    logger, logging.DEBUG, "reddit_analysis_result", "Analysis (candidate %s, score %s): %s",
+                    analysis['is_candidate'], analysis['score'], analysis
+                )
 
                 if analysis['is_candidate'] and analysis['score'] >= relevance_threshold:
                     lead_data = {
@@ -833,11 +845,11 @@ async def process_reddit_leads(job_title: str, skills: List[str], location: str,
                     stored_lead = store_lead(db, lead_data)
                     if stored_lead:
                         leads.append(lead_data)
-                        print(f"✅ Stored Reddit lead for u/{post['author']} with score {analysis['score']}/10")
+                        lead_log.log(logger, logging.INFO, "reddit_stored", "Stored Reddit lead for u/%s with score %s/10", post['author'], analysis['score'])
                 
                 time.sleep(1)
     except Exception as e:
-        print(f"⚠️ Error in Reddit lead generation: {str(e)}")
+        logger.error("Error in Reddit lead generation: %s", e)
         
     return leads
 
@@ -847,7 +859,7 @@ async def find_candidates(job_id: int, skills: List[str], location: str, db: Ses
         # First, find the job
         job = db.query(Job).filter(Job.id == job_id).first()
         if not job:
-            print(f"⚠️ Job not found for ID: {job_id}")
+            logger.warning("Job not found for ID: %s", job_id)
             return {
                 "status": "error",
                 "message": "Job not found. Please provide a valid job ID."
@@ -855,7 +867,7 @@ async def find_candidates(job_id: int, skills: List[str], location: str, db: Ses
 
         # Check if smart hire has already been enabled for this job
         if job.smart_hire_enabled:
-            print(f"⚠️ Smart hire has already been triggered for job ID: {job_id}")
+            logger.warning("Smart hire has already been triggered for job ID: %s", job_id)
             return {
                 "status": "error",
                 "message": "Smart hire has already been triggered for this job."
@@ -929,7 +941,7 @@ async def get_job_leads(job_id: int, db: Session):
             } for lead in leads]
         }
     except Exception as e:
-        print(f"⚠️ Error getting leads: {str(e)}")
+        logger.error("Error getting leads: %s", e)
         return {
             "status": "error",
             "message": str(e)
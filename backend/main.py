@@ -1,3 +1,4 @@
+from startup_report import timed_import, mark_imports_done, startup_report
 from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, WebSocket, Depends, Request, Form
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, EmailStr
@@ -9,21 +10,9 @@ import uvicorn
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
-import cv2
-import numpy as np
-from ultralytics import YOLO
 import base64
 import asyncio
-import mediapipe as mp
-import torch
 import os
-from ultralytics.nn.tasks import DetectionModel
-from resumefilter import process_resumes
-from jobdescgen import generate_job_requirements 
-from exam import websocket_endpoint, get_logs
-from database.database import get_db
-from sqlalchemy.orm import Session
-from attitudedetector import extract_audio_from_video, process_video_and_audio, save_file_locally
 from pathlib import Path
 from applications import create_application_feedback, register_company, CompanyResponse, get_application_feedback, get_company_jobs, get_job_by_id
 from schemas.schemas import ApplicationFeedbackPayload, JobResponse, ApplicationFeedbackRequest
@@ -33,18 +22,50 @@ from models.models import Candidate, CandidateStatus, Job, AttitudeAnalysis, Lea
 from candidate_analytics import get_candidate_performance_metrics
 
 from models.models import Candidate, CandidateStatus, Job, Interviewer, Interview
-from questionGenerator import generate_questions
-from paperCorrection import correct_answer, paper_correction
-from createSurvey import generateQuestionsAndStore
-import time
 from dotenv import load_dotenv
-from ngrok import update_ngrok_url
-from handleWorkflow import handleWorkflow, callPaperCorrection
-from leads import find_candidates, get_job_leads
-from sqlalchemy import func
+import ngrok
+from ngrok import discover_ngrok_url
+from sqlalchemy import func, text
+from fastapi.responses import JSONResponse
+from database.database import engine
 from datetime import datetime, timedelta
 import requests
-import uuid
+from lazy_models import warm_up, model_status
+
+# Startup role: "api" serves CRUD routes only, "proctoring" adds the exam
+# websocket, "media" adds interview video analysis, "all" serves everything.
+APP_ROLE = os.getenv('APP_ROLE', 'all').lower()
+APP_ROLE_MODELS = {"all": ("proctoring", "media"), "api": (), "proctoring": ("proctoring",), "media": ("media",)}
+if APP_ROLE not in APP_ROLE_MODELS:
+    raise ValueError(f"Unknown APP_ROLE '{APP_ROLE}', expected one of {', '.join(APP_ROLE_MODELS)}")
+MODEL_ROLES = APP_ROLE_MODELS[APP_ROLE]
+PROCTORING_ENABLED = "proctoring" in MODEL_ROLES
+MEDIA_ANALYSIS_ENABLED = "media" in MODEL_ROLES
+# Load the role's models in the background at startup instead of on the first request
+WARMUP_MODELS = os.getenv('WARMUP_MODELS', 'false').lower() == 'true'
+# Hold readiness until the ngrok public URL is known (needed when external callbacks hit this worker)
+READY_REQUIRES_PUBLIC_URL = os.getenv('READY_REQUIRES_PUBLIC_URL', 'false').lower() == 'true'
+
+with timed_import("llm_routes"):
+    from resumefilter import process_resumes
+    from jobdescgen import generate_job_requirements 
+    from questionGenerator import generate_questions
+    from paperCorrection import correct_answer, paper_correction
+    from createSurvey import generateQuestionsAndStore
+    from handleWorkflow import handleWorkflow, callPaperCorrection
+
+with timed_import("leads"):
+    from leads import find_candidates, get_job_leads
+
+if PROCTORING_ENABLED:
+    with timed_import("proctoring"):
+        from exam import websocket_endpoint, get_logs, get_proctoring_stats
+
+if MEDIA_ANALYSIS_ENABLED:
+    with timed_import("media_analysis"):
+        from attitudedetector import process_video_and_audio, save_file_locally
+
+mark_imports_done()
 
 # Set environment variable to disable the new security behavior
 os.environ['TORCH_FORCE_WEIGHTS_ONLY'] = '0'
@@ -230,13 +251,29 @@ class RecruitmentAnalytics(BaseModel):
     cost_per_hire: float
     source_effectiveness: dict
 
-@app.websocket("/ws/{candidate_id}")
-async def websocket_handler(websocket: WebSocket, candidate_id: int, db: Session = Depends(get_db)):
-    return await websocket_endpoint(websocket, candidate_id, db)
+if PROCTORING_ENABLED:
+    @app.websocket("/ws/{candidate_id}")
+    async def websocket_handler(websocket: WebSocket, candidate_id: int):
+        # No request-scoped DB session: it would pin a pooled connection for the whole exam
+        return await websocket_endpoint(websocket, candidate_id)
+
+    @app.get("/logs/{candidate_id}")
+    async def get_candidate_logs(candidate_id: int, assessment_id: Optional[int] = None, db: Session = Depends(get_db)):
+        return await get_logs(candidate_id, db, assessment_id)
+
+    @app.get("/proctoring/stats")
+    async def get_proctoring_latency():
+        return await get_proctoring_stats()
 
-@app.get("/logs/{candidate_id}")
-async def get_candidate_logs(candidate_id: int):
-    return await get_logs(candidate_id)
+@app.get("/api/startup-report")
+async def get_startup_report():
+    return startup_report(APP_ROLE)
+
+@app.post("/api/warmup")
+async def warmup_models():
+    """Loads this role's models now so the first real request does not pay for it."""
+    models = await asyncio.get_running_loop().run_in_executor(None, warm_up, MODEL_ROLES)
+    return {"role": APP_ROLE, "models": models}
 
 @app.get("/")
 async def root():
@@ -362,15 +399,15 @@ async def submit_candidate_application(
         payload=request
     )
 
-@app.post("/upload-video/{job_id}/{candidate_id}/{interview_id}")
-async def upload_video(job_id: int, candidate_id: int, interview_id: int, video: UploadFile = File(...), background_tasks: BackgroundTasks = BackgroundTasks(), db: Session = Depends(get_db)):
-    video_path = save_file_locally(video, "video")
-    audio_file_path = UPLOAD_DIR / f"audio_{uuid.uuid4()}_{video.filename.split('.')[0]}.aac"
-    audio_path = extract_audio_from_video(video_path, audio_file_path)
-    background_tasks.add_task(process_video_and_audio, db, job_id, candidate_id,interview_id, video_path, audio_path)
-    return {
-        "success": True
-    }
+if MEDIA_ANALYSIS_ENABLED:
+    @app.post("/upload-video/{job_id}/{candidate_id}/{interview_id}")
+    async def upload_video(job_id: int, candidate_id: int, interview_id: int, video: UploadFile = File(...), background_tasks: BackgroundTasks = BackgroundTasks(), db: Session = Depends(get_db)):
+        video_path = save_file_locally(video, "video")
+        # Audio is decoded from the video in the background task; no .aac is written here
+        background_tasks.add_task(process_video_and_audio, db, job_id, candidate_id,interview_id, video_path)
+        return {
+            "success": True
+        }
 
 
 @app.get("/api/companies/{company_id}/jobs", response_model=List[JobResponse])
@@ -749,11 +786,53 @@ async def submit_answer(submission: AnswerSubmission, db: Session = Depends(get_
 
 @app.on_event("startup")
 async def startup_event():
-    # Wait for ngrok to start
-    time.sleep(5)
-    ngrok_url = update_ngrok_url()
-    if ngrok_url:
-        print(f"Server accessible at: {ngrok_url}")
+    report = startup_report(APP_ROLE)
+    print(f"Starting with role '{APP_ROLE}', imports took {report['total_import_ms']} ms: {report['imports_ms']}")
+    if WARMUP_MODELS:
+        asyncio.get_running_loop().run_in_executor(None, warm_up, MODEL_ROLES)
+
+    # ngrok may come up after us; look for the tunnel in the background so startup is not held up
+    app.state.ngrok_discovery = asyncio.create_task(discover_ngrok_url())
+
+def check_database():
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return {"pool": engine.pool.status()}
+
+@app.get("/health/live")
+async def health_live():
+    """The process is up and the event loop is responsive."""
+    return {"status": "ok", "role": APP_ROLE}
+
+@app.get("/health/ready")
+async def health_ready():
+    """Reports which subsystems are ready; 503 until the required ones are."""
+    checks = {}
+    try:
+        database = await asyncio.wait_for(asyncio.to_thread(check_database), timeout=3)
+        checks["database"] = {"ready": True, **database}
+    except Exception as e:
+        checks["database"] = {"ready": False, "error": str(e) or type(e).__name__}
+
+    models = {name: status for name, status in model_status().items() if status["role"] in MODEL_ROLES}
+    # Models load lazily, so they only hold readiness back when warm-up was asked for or a load failed
+    models_ready = not any(status["error"] for status in models.values())
+    if WARMUP_MODELS:
+        models_ready = models_ready and all(status["loaded"] for status in models.values())
+    checks["models"] = {"ready": models_ready, "warmup": WARMUP_MODELS, "models": models}
+
+    checks["public_url"] = {
+        "ready": ngrok.public_url is not None or not READY_REQUIRES_PUBLIC_URL,
+        "url": ngrok.public_url,
+        "required": READY_REQUIRES_PUBLIC_URL
+    }
+
+    ready = all(check["ready"] for check in checks.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "role": APP_ROLE, "checks": checks}
+    )
+
 @app.get("/api/assessment-status/{candidate_id}/{assessment_id}")
 async def get_assessment_status(
     candidate_id: int,
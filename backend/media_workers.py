@@ -0,0 +1,69 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Configuration
+# Run the video (emotion) and audio (transcription, sentiment, pitch) branches in their own processes
+MEDIA_PARALLEL_BRANCHES = os.getenv('MEDIA_PARALLEL_BRANCHES', 'true').lower() == 'true'
+# CPU threads each branch may use, so TensorFlow and PyTorch do not oversubscribe the cores
+MEDIA_VIDEO_THREADS = int(os.getenv('MEDIA_VIDEO_THREADS', str(max(1, (os.cpu_count() or 2) // 2))))
+MEDIA_AUDIO_THREADS = int(os.getenv('MEDIA_AUDIO_THREADS', str(max(1, (os.cpu_count() or 2) // 2))))
+
+BRANCH_THREADS = {"video": MEDIA_VIDEO_THREADS, "audio": MEDIA_AUDIO_THREADS}
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMEXPR_NUM_THREADS",
+    "TF_NUM_INTRAOP_THREADS", "TRANSCRIPTION_THREADS"
+)
+
+# One long-lived worker per branch, so its models stay loaded between interviews
+pools = {}
+pools_lock = threading.Lock()
+
+
+def limit_threads(threads):
+    """Worker initializer: runs before TensorFlow / PyTorch are imported, so the limits take effect."""
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+    import cv2
+    cv2.setNumThreads(threads)
+
+
+def branch_pool(branch):
+    with pools_lock:
+        pool = pools.get(branch)
+        if pool is None:
+            # spawn: the API process already runs threads that must not be forked
+            pool = ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                initializer=limit_threads, initargs=(BRANCH_THREADS[branch],)
+            )
+            pools[branch] = pool
+        return pool
+
+
+def discard_pool(branch, pool):
+    with pools_lock:
+        if pools.get(branch) is pool:
+            del pools[branch]
+    pool.shutdown(wait=False)
+
+
+def run_in_branch(branch, func, *args):
+    """Submits func to the branch's worker process; a crashed worker is replaced on the next call."""
+    pool = branch_pool(branch)
+    try:
+        future = pool.submit(func, *args)
+    except BrokenProcessPool:
+        discard_pool(branch, pool)
+        pool = branch_pool(branch)
+        future = pool.submit(func, *args)
+
+    def forget_broken(done):
+        if not done.cancelled() and isinstance(done.exception(), BrokenProcessPool):
+            discard_pool(branch, pool)
+
+    future.add_done_callback(forget_broken)
+    return future
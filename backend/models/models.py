@@ -188,6 +188,22 @@ class CandidateAssessment(Base):
     candidate = relationship("Candidate", back_populates="assessments")
     assessment = relationship("Assessment", back_populates="candidate_assessments")
     answers = relationship("Answer", back_populates="candidate_assessment")
+    proctoring_events = relationship("ProctoringEvent", back_populates="candidate_assessment")
+
+class ProctoringEvent(Base):
+    __tablename__ = "proctoring_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    candidate_assessment_id = Column(Integer, ForeignKey("candidate_assessments.id", ondelete="CASCADE"), nullable=True, index=True)
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"), index=True)
+    event = Column(String(255), nullable=False)  # e.g. "Phone Face Away"
+    start_frame = Column(Integer, nullable=False)
+    end_frame = Column(Integer, nullable=False)  # Consecutive frames with the same event are one interval
+    started_at = Column(DateTime, nullable=False)
+    ended_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    candidate_assessment = relationship("CandidateAssessment", back_populates="proctoring_events")
 
 class Question(Base):
     __tablename__ = "questions"
@@ -0,0 +1,72 @@
+import os
+import cv2
+import numpy as np
+
+# Configuration
+PROCTOR_MOTION_GATE = os.getenv('PROCTOR_MOTION_GATE', 'true').lower() == 'true'
+# Mean absolute grey-level difference (0-255) of the most-changed block below which a frame
+# counts as unchanged; per block, so a small object entering the frame is not averaged away
+PROCTOR_MOTION_THRESHOLD = float(os.getenv('PROCTOR_MOTION_THRESHOLD', '6.0'))
+# Block size in thumbnail pixels (a 64-pixel-wide thumbnail has 8 blocks per row)
+PROCTOR_MOTION_BLOCK = int(os.getenv('PROCTOR_MOTION_BLOCK', '8'))
+# Force a full detector pass after this many consecutive skipped frames
+PROCTOR_MOTION_FULL_PASS_EVERY = int(os.getenv('PROCTOR_MOTION_FULL_PASS_EVERY', '10'))
+PROCTOR_MOTION_GATE_WIDTH = int(os.getenv('PROCTOR_MOTION_GATE_WIDTH', '64'))
+
+
+class MotionGate:
+    """Decides whether a frame differs enough from the last analyzed one to re-run detection.
+
+    Frames are compared as small greyscale thumbnails against the frame the
+    detector last ran on, so slow drift still accumulates into a full pass.
+    """
+
+    def __init__(self, enabled=PROCTOR_MOTION_GATE, threshold=PROCTOR_MOTION_THRESHOLD,
+                 full_pass_every=PROCTOR_MOTION_FULL_PASS_EVERY, width=PROCTOR_MOTION_GATE_WIDTH, block=PROCTOR_MOTION_BLOCK):
+        self.enabled = enabled
+        self.threshold = threshold
+        self.full_pass_every = max(1, full_pass_every)
+        self.width = width
+        self.block = max(1, block)
+        self.reference = None
+        self.skipped_in_row = 0
+        self.checked = 0
+        self.skipped = 0
+
+    def signature(self, frame):
+        h, w = frame.shape[:2]
+        height = max(1, round(h * self.width / w))
+        grey = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(grey, (self.width, height), interpolation=cv2.INTER_AREA).astype(np.int16)
+
+    def change(self, signature):
+        """Largest per-block mean absolute difference from the reference thumbnail."""
+        diff = np.abs(signature - self.reference).astype(np.float32)
+        h, w = diff.shape
+        b = self.block
+        # Edge rows / columns are repeated so partial blocks at the border still count
+        diff = np.pad(diff, ((0, -h % b), (0, -w % b)), mode="edge")
+        blocks = diff.reshape(diff.shape[0] // b, b, diff.shape[1] // b, b).mean(axis=(1, 3))
+        return float(blocks.max())
+
+    def should_skip(self, signature):
+        """True when the previous detection result can be reused for this frame."""
+        self.checked += 1
+        skip = (
+            self.enabled
+            and self.reference is not None
+            and self.reference.shape == signature.shape
+            and self.skipped_in_row < self.full_pass_every
+            and self.change(signature) < self.threshold
+        )
+        if skip:
+            self.skipped += 1
+            self.skipped_in_row += 1
+        return skip
+
+    def mark_analyzed(self, signature):
+        self.reference = signature
+        self.skipped_in_row = 0
+
+    def skip_ratio(self):
+        return round(self.skipped / self.checked, 3) if self.checked else 0.0
@@ -1,23 +1,34 @@
+import asyncio
+import os
 import requests
 
+# Configuration
+NGROK_API_URL = os.getenv('NGROK_API_URL', 'http://localhost:4040/api/tunnels')
+NGROK_DISCOVERY_ATTEMPTS = int(os.getenv('NGROK_DISCOVERY_ATTEMPTS', '30'))
+NGROK_DISCOVERY_INTERVAL_SECONDS = float(os.getenv('NGROK_DISCOVERY_INTERVAL_SECONDS', '2'))
 
-def update_ngrok_url():
+# Set once discovery succeeds; read by the readiness check
+public_url = None
+
+
+def update_ngrok_url(log_errors=True):
+    global public_url
     try:
         # Get ngrok public url from its API
-        response = requests.get("http://localhost:4040/api/tunnels")
+        response = requests.get(NGROK_API_URL, timeout=2)
         tunnels = response.json()["tunnels"]
-        
+
         # Get the HTTPS tunnel URL
         ngrok_url = next(
             tunnel["public_url"]
-            for tunnel in tunnels 
+            for tunnel in tunnels
             if tunnel["proto"] == "https"
         )
-        
+
         # Read existing .env file
         with open('.env', 'r') as file:
             env_lines = file.readlines()
-        
+
         # Update or add NGROK_URL
         ngrok_url_found = False
         for i, line in enumerate(env_lines):
@@ -25,17 +36,32 @@ def update_ngrok_url():
                 env_lines[i] = f'NGROK_URL={ngrok_url}\n'
                 ngrok_url_found = True
                 break
-        
+
         if not ngrok_url_found:
             env_lines.append(f'NGROK_URL={ngrok_url}\n')
-        
+
         # Write back to .env file
         with open('.env', 'w') as file:
             file.writelines(env_lines)
-            
+
+        # load_dotenv already ran, so also update this process
+        os.environ['NGROK_URL'] = ngrok_url
+        public_url = ngrok_url
         print(f"Updated NGROK_URL to {ngrok_url}")
         return ngrok_url
-        
+
     except Exception as e:
-        print(f"Error updating ngrok URL: {str(e)}")
-        return None
\ No newline at end of file
+        if log_errors:
+            print(f"Error updating ngrok URL: {str(e)}")
+        return None
+
+
+async def discover_ngrok_url(attempts=NGROK_DISCOVERY_ATTEMPTS, interval=NGROK_DISCOVERY_INTERVAL_SECONDS):
+    """Polls the ngrok API in the background until a tunnel shows up, without blocking the event loop."""
+    for attempt in range(1, attempts + 1):
+        ngrok_url = await asyncio.to_thread(update_ngrok_url, attempt == attempts)
+        if ngrok_url:
+            return ngrok_url
+        await asyncio.sleep(interval)
+    print(f"ngrok tunnel not found after {attempts} attempts; NGROK_URL left unchanged")
+    return None
@@ -4,6 +4,9 @@ from typing import List
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from models.models import CandidateAssessment
+from app_logging import get_logger
+
+logger = get_logger(__name__)
 
 
 class Answer(BaseModel):
@@ -77,6 +80,8 @@ def paper_correction(questions: List[Answer], db: Session):
             if result and "score" in result:
                 break
             retries += 1
+        if not result or "score" not in result:
+            logger.warning("Could not score answer %s after %s attempts, scoring it 0", answer["id"], max_retries + 1)
         
         score = result.get("score", 0) if result and "score" in result else 0
         db.query(Answer).filter(Answer.id == answer["id"]).update({"score": score})
@@ -0,0 +1,70 @@
+import os
+import torch
+from ultralytics import YOLO
+
+# Configuration
+# torch: PyTorch .pt weights, onnx: ONNX Runtime (.onnx), openvino: OpenVINO IR (*_openvino_model/)
+PROCTOR_DETECTOR_BACKEND = os.getenv('PROCTOR_DETECTOR_BACKEND', 'torch').lower()
+PROCTOR_DETECTOR_MODEL = os.getenv('PROCTOR_DETECTOR_MODEL', 'yolov8x.pt')
+PROCTOR_DETECTOR_IMGSZ = int(os.getenv('PROCTOR_DETECTOR_IMGSZ', '640'))
+PROCTOR_DETECTOR_CONF = float(os.getenv('PROCTOR_DETECTOR_CONF', '0.3'))
+
+DETECTOR_BACKENDS = ("torch", "onnx", "openvino")
+PHONE_CLASS = 67  # COCO "cell phone"
+
+# Override torch.load default behavior
+original_torch_load = torch.load
+torch.load = lambda *args, **kwargs: original_torch_load(*args, weights_only=False, **kwargs)
+
+
+class PhoneDetector:
+    """YOLO phone detector on a configurable runtime.
+
+    Ultralytics dispatches on the weights format, so the same predict call
+    runs PyTorch, ONNX Runtime or OpenVINO models exported with export_detector().
+    """
+
+    def __init__(self, model_path=PROCTOR_DETECTOR_MODEL, backend=PROCTOR_DETECTOR_BACKEND,
+                 conf=PROCTOR_DETECTOR_CONF, imgsz=PROCTOR_DETECTOR_IMGSZ):
+        if backend not in DETECTOR_BACKENDS:
+            raise ValueError(f"Unknown detector backend '{backend}', expected one of {DETECTOR_BACKENDS}")
+        self.model_path = model_path
+        self.backend = backend
+        self.conf = conf
+        self.imgsz = imgsz
+        self.model = YOLO(model_path, task="detect")
+
+    def detect(self, frames):
+        """Returns an (N, 6) array of [x1, y1, x2, y2, conf, cls] phone boxes per frame."""
+        results = self.model.predict(frames, conf=self.conf, classes=[PHONE_CLASS], imgsz=self.imgsz, verbose=False)
+        return [result.boxes.data.cpu().numpy() for result in results]
+
+    def describe(self):
+        return {"backend": self.backend, "model": self.model_path, "imgsz": self.imgsz, "conf": self.conf}
+
+
+def export_detector(weights="yolov8n.pt", backend="openvino", int8=False, imgsz=PROCTOR_DETECTOR_IMGSZ, data=None):
+    """Exports YOLO weights for a CPU runtime and returns the path to load with PhoneDetector.
+
+    OpenVINO INT8 uses post-training quantization calibrated on `data`
+    (a dataset yaml, coco128 by default). ONNX INT8 applies ONNX Runtime
+    dynamic weight quantization to the exported graph.
+    """
+    if backend not in ("onnx", "openvino"):
+        raise ValueError(f"Export is only needed for onnx or openvino, got '{backend}'")
+
+    model = YOLO(weights, task="detect")
+    export_args = {"format": backend, "imgsz": imgsz, "dynamic": True}
+    if backend == "openvino" and int8:
+        export_args["int8"] = True
+        if data:
+            export_args["data"] = data
+    exported_path = model.export(**export_args)
+
+    if backend == "onnx" and int8:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        quantized_path = exported_path.replace(".onnx", "_int8.onnx")
+        quantize_dynamic(exported_path, quantized_path, weight_type=QuantType.QUInt8)
+        exported_path = quantized_path
+
+    return exported_path
@@ -0,0 +1,166 @@
+import os
+from collections import deque
+from datetime import datetime
+from sqlalchemy import func
+from database.database import SessionLocal
+from models.models import CandidateAssessment, ProctoringEvent
+
+# Configuration
+PROCTOR_EVENT_LOG_MAX_INTERVALS = int(os.getenv('PROCTOR_EVENT_LOG_MAX_INTERVALS', '500'))
+PROCTOR_EVENT_FLUSH_SECONDS = float(os.getenv('PROCTOR_EVENT_FLUSH_SECONDS', '10'))
+PROCTOR_EVENT_FLUSH_INTERVALS = int(os.getenv('PROCTOR_EVENT_FLUSH_INTERVALS', '50'))
+# The honesty score is checkpointed every N seconds or M frames, whichever comes first
+PROCTOR_SCORE_CHECKPOINT_SECONDS = float(os.getenv('PROCTOR_SCORE_CHECKPOINT_SECONDS', '15'))
+PROCTOR_SCORE_CHECKPOINT_FRAMES = int(os.getenv('PROCTOR_SCORE_CHECKPOINT_FRAMES', '30'))
+
+
+def interval_entry(interval):
+    """API representation of an interval; keeps the old per-frame log keys."""
+    return {
+        "timestamp": interval["started_at"].isoformat(),
+        "frame": interval["start_frame"],
+        "event": interval["event"],
+        "end_timestamp": interval["ended_at"].isoformat(),
+        "end_frame": interval["end_frame"],
+        "frames": interval["end_frame"] - interval["start_frame"] + 1
+    }
+
+
+class EventLog:
+    """Run-length encoded violation log for one proctoring session.
+
+    Consecutive frames with the same event collapse into one interval. Both
+    the recent intervals kept for /logs and the intervals waiting to be
+    persisted are capped, so a long exam cannot grow memory without bound.
+    """
+
+    def __init__(self, max_intervals=PROCTOR_EVENT_LOG_MAX_INTERVALS):
+        self.recent = deque(maxlen=max_intervals)
+        self.pending = deque(maxlen=max_intervals)
+        self.current = None
+        self.last_flush = datetime.now()
+
+    def record(self, frame, event, timestamp=None):
+        timestamp = timestamp or datetime.now()
+        if self.current and self.current["event"] == event and self.current["end_frame"] == frame - 1:
+            self.current["end_frame"] = frame
+            self.current["ended_at"] = timestamp
+            return
+        self.close()
+        self.current = {"event": event, "start_frame": frame, "end_frame": frame, "started_at": timestamp, "ended_at": timestamp}
+
+    def close(self):
+        """Ends the open interval so it can be persisted."""
+        if self.current:
+            self.recent.append(self.current)
+            self.pending.append(self.current)
+            self.current = None
+
+    def flush_due(self):
+        return bool(self.pending or self.current) and (
+            len(self.pending) >= PROCTOR_EVENT_FLUSH_INTERVALS
+            or (datetime.now() - self.last_flush).total_seconds() >= PROCTOR_EVENT_FLUSH_SECONDS
+        )
+
+    def drain(self):
+        """Closes the open interval and hands over everything not yet persisted."""
+        self.close()
+        intervals = list(self.pending)
+        self.pending.clear()
+        self.last_flush = datetime.now()
+        return intervals
+
+    def requeue(self, intervals):
+        """Puts intervals back after a failed flush; the oldest fall off if the cap is hit."""
+        # A bounded deque trims from the left, so rebuild oldest-first instead of extendleft,
+        # which would push out the newest pending intervals
+        self.pending = deque(list(intervals) + list(self.pending), maxlen=self.pending.maxlen)
+
+    def entries(self):
+        intervals = list(self.recent) + ([self.current] if self.current else [])
+        return [interval_entry(interval) for interval in intervals]
+
+
+def load_persisted_session(candidate_id, assessment_id=None):
+    """Session state rebuilt from the CandidateAssessment and its persisted intervals.
+
+    Used when the session store has nothing (e.g. after a restart), so a
+    reconnect continues the stored honesty score instead of starting at 100.
+    """
+    db = SessionLocal()
+    try:
+        query = db.query(CandidateAssessment.id, CandidateAssessment.honesty_score).filter(CandidateAssessment.candidate_id == candidate_id)
+        if assessment_id is not None:
+            query = query.filter(CandidateAssessment.assessment_id == assessment_id)
+        row = query.order_by(CandidateAssessment.id.desc()).first()
+        if row is None:
+            return None
+        last_frame, penalty_frames = db.query(
+            func.max(ProctoringEvent.end_frame),
+            func.sum(ProctoringEvent.end_frame - ProctoringEvent.start_frame + 1)
+        ).filter(ProctoringEvent.candidate_assessment_id == row.id).one()
+    finally:
+        db.close()
+
+    honesty_score = row.honesty_score if row.honesty_score is not None else 100.0
+    penalty_frames = int(penalty_frames or 0)
+    total_frames = int(last_frame or 0)
+    # Clean frames after the last interval are not stored; recover them from the score
+    if penalty_frames and honesty_score < 100:
+        total_frames = max(total_frames, round(penalty_frames * 100 / (100 - honesty_score)))
+    return {
+        "candidate_assessment_id": row.id,
+        "total_frames": total_frames,
+        "penalty_frames": penalty_frames,
+        "honesty_score": honesty_score,
+        "checkpointed_score": honesty_score,
+        "dropped_frames": 0
+    }
+
+
+def persist_checkpoint(candidate_id, candidate_assessment_id, intervals, honesty_score=None):
+    """Writes a batch of intervals and the latest honesty score in one short-lived transaction."""
+    if not intervals and (honesty_score is None or candidate_assessment_id is None):
+        return
+    db = SessionLocal()
+    try:
+        if honesty_score is not None and candidate_assessment_id is not None:
+            db.query(CandidateAssessment).filter(
+                CandidateAssessment.id == candidate_assessment_id
+            ).update({CandidateAssessment.honesty_score: honesty_score}, synchronize_session=False)
+        db.bulk_save_objects([
+            ProctoringEvent(
+                candidate_id=candidate_id,
+                candidate_assessment_id=candidate_assessment_id,
+                event=interval["event"],
+                start_frame=interval["start_frame"],
+                end_frame=interval["end_frame"],
+                started_at=interval["started_at"],
+                ended_at=interval["ended_at"]
+            )
+            for interval in intervals
+        ])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def load_events(db, candidate_id, assessment_id=None, limit=PROCTOR_EVENT_LOG_MAX_INTERVALS):
+    """Persisted intervals for a candidate (optionally one assessment), oldest first."""
+    query = db.query(ProctoringEvent).filter(ProctoringEvent.candidate_id == candidate_id)
+    if assessment_id is not None:
+        query = query.join(CandidateAssessment).filter(CandidateAssessment.assessment_id == assessment_id)
+    events = query.order_by(ProctoringEvent.started_at.desc()).limit(limit).all()
+    return [
+        interval_entry({
+            "event": event.event,
+            "start_frame": event.start_frame,
+            "end_frame": event.end_frame,
+            "started_at": event.started_at,
+            "ended_at": event.ended_at
+        })
+        for event in reversed(events)
+    ]
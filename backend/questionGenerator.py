@@ -2,6 +2,9 @@ import ollama
 from typing import List
 import requests
 from stringToJSON import getJSON
+from app_logging import get_logger
+
+logger = get_logger(__name__)
 
 json_format = {
     "questions": {
@@ -133,7 +136,7 @@ def generate_questions(  num_mcq: int, num_openended: int, num_coding: int, diff
     # print(response.json())
     # data = response.json()["output"]["content"]
     data = response["message"]["content"]
-    print(data)
+    logger.debug("Question generator output: %s", data)
     # Extract the JSON string between ```{}```
     return getJSON(data, json_format)
     
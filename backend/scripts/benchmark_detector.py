@@ -0,0 +1,80 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+import numpy as np
+from phone_detector import PhoneDetector, export_detector, DETECTOR_BACKENDS
+from scripts.recorded_frames import load_frames
+
+# Usage:
+#   python scripts/benchmark_detector.py --export yolov8n.pt --backend openvino --int8
+#   python scripts/benchmark_detector.py --frames recordings/session_1 --model yolov8n_int8_openvino_model/ --backend openvino
+
+def box_iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+def run_detector(detector, frames, batch_size):
+    """Returns (detections per frame, frames per second)."""
+    detector.detect(frames[:1])  # warm-up
+    detections = []
+    start = time.perf_counter()
+    for i in range(0, len(frames), batch_size):
+        detections.extend(detector.detect(frames[i:i + batch_size]))
+    elapsed = time.perf_counter() - start
+    return detections, len(frames) / elapsed
+
+def agreement(reference, candidate):
+    """Share of frames with the same phone/no-phone verdict, and mean best-box IoU where both fired."""
+    same_verdict = sum((len(r) > 0) == (len(c) > 0) for r, c in zip(reference, candidate))
+    ious = [
+        max(box_iou(r_box, c_box) for c_box in c)
+        for r, c in zip(reference, candidate) if len(r) and len(c)
+        for r_box in r
+    ]
+    return same_verdict / len(reference), (float(np.mean(ious)) if ious else None)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark a phone detector backend against the reference model")
+    parser.add_argument("--frames", help="Directory of recorded JPEG frames or a video file")
+    parser.add_argument("--limit", type=int, default=500, help="Maximum number of frames to load")
+    parser.add_argument("--model", default="yolov8x.pt", help="Model to benchmark")
+    parser.add_argument("--backend", default="torch", choices=DETECTOR_BACKENDS)
+    parser.add_argument("--reference", default="yolov8x.pt", help="Reference PyTorch weights")
+    parser.add_argument("--batch", type=int, default=1)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--export", metavar="WEIGHTS", help="Export WEIGHTS for --backend instead of benchmarking")
+    parser.add_argument("--int8", action="store_true", help="Quantize to INT8 when exporting")
+    parser.add_argument("--data", help="Calibration dataset yaml for OpenVINO INT8 export")
+    args = parser.parse_args()
+
+    if args.export:
+        path = export_detector(args.export, args.backend, int8=args.int8, imgsz=args.imgsz, data=args.data)
+        print(f"Exported {args.export} -> {path}")
+        return
+
+    if not args.frames:
+        parser.error("--frames is required when benchmarking")
+
+    frames = load_frames(args.frames, args.limit)
+    print(f"Loaded {len(frames)} frames from {args.frames}")
+
+    reference = PhoneDetector(args.reference, "torch", imgsz=args.imgsz)
+    reference_detections, reference_fps = run_detector(reference, frames, args.batch)
+    print(f"Reference  {args.reference:<40} {reference_fps:8.2f} fps")
+
+    candidate = PhoneDetector(args.model, args.backend, imgsz=args.imgsz)
+    candidate_detections, candidate_fps = run_detector(candidate, frames, args.batch)
+    print(f"Candidate  {args.model:<40} {candidate_fps:8.2f} fps ({candidate_fps / reference_fps:.2f}x)")
+
+    verdict_agreement, mean_iou = agreement(reference_detections, candidate_detections)
+    print(f"Phone verdict agreement: {verdict_agreement * 100:.1f}%")
+    print(f"Mean box IoU where both detected a phone: {mean_iou:.3f}" if mean_iou is not None else "No frames where both detected a phone")
+
+if __name__ == "__main__":
+    main()
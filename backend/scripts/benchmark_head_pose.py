@@ -0,0 +1,101 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+import cv2
+import numpy as np
+from face_mesh_pool import create_face_mesh
+from head_pose import HeadPoseEstimator, PROCTOR_FACE_AWAY_YAW_DEGREES
+from scripts.recorded_frames import load_frames
+
+# Usage:
+#   python scripts/benchmark_head_pose.py --frames recordings/session_1 --repeat 20
+
+def legacy_estimate_yaw(landmarks, w, h):
+    """The per-frame head-pose path exam.py used before head_pose.py, kept as the reference."""
+    image_points = np.array([
+        [landmarks[1].x * w, landmarks[1].y * h],
+        [landmarks[33].x * w, landmarks[33].y * h],
+        [landmarks[263].x * w, landmarks[263].y * h],
+        [landmarks[61].x * w, landmarks[61].y * h],
+        [landmarks[291].x * w, landmarks[291].y * h],
+        [landmarks[199].x * w, landmarks[199].y * h],
+        [landmarks[419].x * w, landmarks[419].y * h],
+        [landmarks[4].x * w, landmarks[4].y * h],
+        [landmarks[152].x * w, landmarks[152].y * h]
+    ], dtype="double")
+
+    model_points = np.array([
+        [0.0, 0.0, 0.0], [-30.0, -30.0, -30.0], [30.0, -30.0, -30.0],
+        [-30.0, 30.0, -30.0], [30.0, 30.0, -30.0], [-30.0, -40.0, -30.0],
+        [30.0, -40.0, -30.0], [0.0, -10.0, -30.0], [0.0, 40.0, -30.0]
+    ])
+
+    camera_matrix = np.array([
+        [w, 0, w / 2],
+        [0, w, h / 2],
+        [0, 0, 1]
+    ], dtype="double")
+
+    success, rotation_vector, _ = cv2.solvePnP(model_points, image_points, camera_matrix, None)
+    if not success:
+        return None
+    rmat, _ = cv2.Rodrigues(rotation_vector)
+    proj_matrix = np.hstack((rmat, np.zeros((3, 1))))
+    euler_angles, _, _, _, _, _, _ = cv2.decomposeProjectionMatrix(proj_matrix)
+    return abs(euler_angles[1, 0])
+
+def extract_landmarks(frames):
+    """Runs FaceMesh once over the recording; returns [(landmarks, w, h)] for frames with a face."""
+    face_mesh = create_face_mesh()
+    samples = []
+    for frame in frames:
+        results = face_mesh.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if results.multi_face_landmarks:
+            h, w = frame.shape[:2]
+            samples.append((results.multi_face_landmarks[0].landmark, w, h))
+    face_mesh.close()
+    return samples
+
+def run(estimate, samples, repeat):
+    """Returns (yaw per sample from the first pass, microseconds per call)."""
+    yaws = [estimate(landmarks, w, h) for landmarks, w, h in samples]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for landmarks, w, h in samples:
+            estimate(landmarks, w, h)
+    elapsed = time.perf_counter() - start
+    return yaws, elapsed / (repeat * len(samples)) * 1e6
+
+def compare(reference, candidate):
+    pairs = [(r, c) for r, c in zip(reference, candidate) if r is not None and c is not None]
+    errors = [abs(r - c) for r, c in pairs]
+    same_verdict = sum((r > PROCTOR_FACE_AWAY_YAW_DEGREES) == (c > PROCTOR_FACE_AWAY_YAW_DEGREES) for r, c in pairs)
+    return max(errors, default=0.0), float(np.mean(errors)) if errors else 0.0, same_verdict / len(pairs) if pairs else 1.0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark head-pose estimation against the legacy solvePnP path")
+    parser.add_argument("--frames", required=True, help="Directory of recorded JPEG frames or a video file")
+    parser.add_argument("--limit", type=int, default=300, help="Maximum number of frames to load")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed passes over the landmarks")
+    args = parser.parse_args()
+
+    samples = extract_landmarks(load_frames(args.frames, args.limit))
+    if not samples:
+        sys.exit("No faces found in the recording")
+    print(f"{len(samples)} frames with a face")
+
+    legacy_yaws, legacy_us = run(legacy_estimate_yaw, samples, args.repeat)
+    print(f"Legacy (solvePnP + Rodrigues + decomposeProjectionMatrix): {legacy_us:8.1f} us/frame")
+
+    for name, tracking in (("cached intrinsics", False), ("cached intrinsics + extrinsic guess", True)):
+        # Sequential passes over the recording, so the guess comes from the previous frame
+        estimator = HeadPoseEstimator(tracking=tracking)
+        yaws, us = run(estimator.estimate_yaw, samples, args.repeat)
+        max_error, mean_error, agreement = compare(legacy_yaws, yaws)
+        print(f"{name:<36} {us:8.1f} us/frame ({legacy_us / us:.2f}x) | yaw error max {max_error:.2f} mean {mean_error:.2f} deg | face-away agreement {agreement * 100:.1f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from audio_decoder import decode_audio, AUDIO_SAMPLE_RATE
+from voice_features import voice_features
+
+# Usage:
+#   python scripts/benchmark_pitch.py --minutes 60              # synthetic hour-long voice-like signal
+#   python scripts/benchmark_pitch.py --file interview.webm --librosa
+#
+# Every run first checks that silent and half-silent input is not reported as voiced.
+
+def synthetic_voice(minutes, sample_rate=AUDIO_SAMPLE_RATE, seed=0):
+    """Harmonic 'speech' with a gliding F0 around 160 Hz, syllable-rate bursts, pauses and noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(minutes * 60 * sample_rate)) / sample_rate
+    f0 = 160 + 30 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    # ~4 syllables per second, with a 1 s pause every 6 s
+    envelope = np.clip(np.sin(2 * np.pi * 2 * t), 0, None) * (t % 6 < 5)
+    return (0.3 * voice * envelope + 0.003 * rng.standard_normal(len(t))).astype(np.float32)
+
+def check_silence(sample_rate=AUDIO_SAMPLE_RATE):
+    """Regression check: silence must not read as voiced speech (it used to come out as 400 Hz)."""
+    silent = voice_features(np.zeros(2 * sample_rate, dtype=np.float32))
+    assert silent["voiced_ratio"] == 0.0 and silent["pitch_mean"] == 0.0, f"silent input reported as voiced: {silent}"
+
+    t = np.arange(10 * sample_rate) / sample_rate
+    tone = (0.3 * np.sin(2 * np.pi * 150 * t)).astype(np.float32)
+    half_silent = voice_features(np.concatenate([tone, np.zeros(30 * sample_rate, dtype=np.float32)]))
+    assert abs(half_silent["pitch_mean"] - 150) < 5, f"trailing silence skewed the pitch: {half_silent}"
+    assert half_silent["voiced_ratio"] < 0.3, f"trailing silence counted as voiced: {half_silent}"
+    print("Silence check passed")
+
+def measure(func, *args):
+    """Returns (result, seconds, peak traced allocations in MB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2 ** 20
+
+def librosa_pitch_mean(audio):
+    """The previous analyze_audio path."""
+    import librosa
+    pitches, _ = librosa.piptrack(y=audio, sr=AUDIO_SAMPLE_RATE)
+    pitch_values = pitches[pitches > 0]
+    return float(np.mean(pitch_values)) if len(pitch_values) else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the YIN voice features against librosa.piptrack")
+    parser.add_argument("--file", help="Audio or video file (default: synthetic signal)")
+    parser.add_argument("--minutes", type=float, default=60, help="Length of the synthetic signal")
+    parser.add_argument("--librosa", action="store_true", help="Also run librosa.piptrack (slow and memory-hungry on long inputs)")
+    args = parser.parse_args()
+
+    check_silence()
+    audio = decode_audio(args.file) if args.file else synthetic_voice(args.minutes)
+    duration = len(audio) / AUDIO_SAMPLE_RATE
+    print(f"{duration / 60:.1f} min of audio, input buffer {audio.nbytes / 2 ** 20:.0f} MB")
+
+    features, elapsed, peak = measure(voice_features, audio)
+    print(f"YIN (streaming)  {elapsed:7.2f} s ({duration / elapsed:6.0f}x real time) | peak extra memory {peak:7.1f} MB")
+    print(f"  pitch mean {features['pitch_mean']:.1f} Hz | variance {features['pitch_variance']:.1f} | "
+          f"voiced {features['voiced_ratio'] * 100:.0f}% | speaking rate {features['speaking_rate']:.2f} syllables/s")
+
+    if args.librosa:
+        pitch_mean, elapsed, peak = measure(librosa_pitch_mean, audio)
+        print(f"librosa.piptrack {elapsed:7.2f} s ({duration / elapsed:6.0f}x real time) | peak extra memory {peak:7.1f} MB")
+        print(f"  pitch mean {pitch_mean:.1f} Hz")
+
+if __name__ == "__main__":
+    main()
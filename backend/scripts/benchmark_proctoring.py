@@ -0,0 +1,154 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# CPU-only replay: hide any GPU before torch / ultralytics are imported
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+
+import argparse
+import asyncio
+import logging
+import random
+import resource
+import time
+import cv2
+import numpy as np
+import exam
+from frame_protocol import unpack_message, PROTOCOL_BINARY
+from scripts.recorded_frames import load_frames
+
+# Usage:
+#   python scripts/benchmark_proctoring.py --frames recordings/session_1 --candidates 8 --fps 2
+#   python scripts/benchmark_proctoring.py --frames exam.mp4 --candidates 32 --fps 1 --annotate violations --adaptive
+#
+# Replays recorded frames through exam.websocket_endpoint, one simulated
+# websocket per candidate. Nothing is written to the database.
+
+class ReplayWebSocket:
+    """Stands in for a candidate's browser: sends JPEG frames at a fixed rate and collects results."""
+
+    def __init__(self, frames, fps, query_params, start_delay=0.0):
+        self.frames = frames
+        self.interval = 1.0 / fps
+        self.query_params = query_params
+        self.start_delay = start_delay
+        self.next_index = 0
+        self.next_send = None
+        self.results = []
+        self.controls = 0
+
+    async def accept(self):
+        self.next_send = time.perf_counter() + self.start_delay
+
+    async def receive(self):
+        if self.next_index >= len(self.frames):
+            return {"type": "websocket.disconnect", "code": 1000}
+        delay = self.next_send - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.next_send += self.interval
+        frame = self.frames[self.next_index]
+        self.next_index += 1
+        return {"type": "websocket.receive", "bytes": frame}
+
+    def handle(self, message):
+        if message.get("type") == "control":
+            # Adaptive mode: follow the server's requested capture rate like the frontend does
+            self.controls += 1
+            self.interval = 1.0 / message["fps"]
+        else:
+            self.results.append(message)
+
+    async def send_bytes(self, data):
+        header, _ = unpack_message(data)
+        self.handle(header)
+
+    async def send_json(self, message):
+        self.handle(message)
+
+def encode_frames(frames, width, quality):
+    """JPEG-encodes the recording once, the way the browser would send it."""
+    encoded = []
+    for frame in frames:
+        if width and frame.shape[1] > width:
+            frame = cv2.resize(frame, (width, int(frame.shape[0] * width / frame.shape[1])), interpolation=cv2.INTER_AREA)
+        _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        encoded.append(buffer.tobytes())
+    return encoded
+
+def disable_persistence():
+    """The replay measures the frame pipeline only; skip Postgres lookups and checkpoints."""
+    exam.load_persisted_session = lambda candidate_id, assessment_id=None: None
+    exam.persist_checkpoint = lambda *args: None
+
+async def replay(frames, args):
+    query_params = {"protocol": PROTOCOL_BINARY, "annotate": args.annotate, "adaptive": "true" if args.adaptive else "false", "fps": str(args.fps)}
+    sockets = [
+        # Candidates start at random points within one capture interval, like real clients
+        ReplayWebSocket(frames, args.fps, query_params, start_delay=random.uniform(0, 1.0 / args.fps))
+        for _ in range(args.candidates)
+    ]
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        exam.websocket_endpoint(websocket, args.first_candidate_id + i)
+        for i, websocket in enumerate(sockets)
+    ))
+    return sockets, time.perf_counter() - start
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+def report(sockets, elapsed, args):
+    results = [result for websocket in sockets for result in websocket.results]
+    latencies = [result["timings"]["queue"] + result["timings"]["total"] for result in results]
+    sent = sum(websocket.next_index for websocket in sockets)
+
+    print(f"\nCandidates: {args.candidates} | capture rate: {args.fps} fps each | annotate: {args.annotate}")
+    print(f"Frames sent: {sent} | analyzed: {len(results)} | dropped: {sent - len(results)}")
+    print(f"Throughput: {len(results) / elapsed:.2f} analyzed fps over {elapsed:.1f} s")
+    print(f"Latency (ms, receive -> result): p50 {percentile(latencies, 50):.1f} | p95 {percentile(latencies, 95):.1f} | p99 {percentile(latencies, 99):.1f} | max {max(latencies, default=0):.1f}")
+
+    print("Per-stage time (ms per analyzed frame):")
+    for stage in exam.PROCTOR_STAGES:
+        values = [result["timings"].get(stage, 0.0) for result in results]
+        print(f"  {stage:<16} mean {np.mean(values) if values else 0:8.2f} | p95 {percentile(values, 95):8.2f}")
+
+    if args.adaptive:
+        print(f"Control messages: {sum(websocket.controls for websocket in sockets)}")
+    print(f"Phone batching: {exam.phone_scheduler.stats()}")
+    print(f"FaceMesh pool: {exam.face_mesh_pool.stats()}")
+    # ru_maxrss is in KB on Linux
+    print(f"Peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded frames through the proctoring pipeline")
+    parser.add_argument("--frames", required=True, help="Directory of recorded JPEG frames or a video file")
+    parser.add_argument("--limit", type=int, default=300, help="Maximum number of frames to load")
+    parser.add_argument("--candidates", type=int, default=4, help="Concurrent simulated candidates")
+    parser.add_argument("--fps", type=float, default=2.0, help="Capture rate per candidate")
+    parser.add_argument("--width", type=int, default=640, help="Resize frames to this width before sending")
+    parser.add_argument("--quality", type=int, default=80, help="JPEG quality of the sent frames")
+    parser.add_argument("--annotate", default="none", choices=["always", "violations", "none"])
+    parser.add_argument("--adaptive", action="store_true", help="Follow the server's frame-rate control messages")
+    parser.add_argument("--first-candidate-id", type=int, default=900000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="Keep the per-frame pipeline output")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    frames = encode_frames(load_frames(args.frames, args.limit), args.width, args.quality)
+    print(f"Loaded {len(frames)} frames from {args.frames}")
+
+    disable_persistence()
+    # Load the models up front so the first frames do not include load time
+    exam.phone_detector.get()
+    print(f"Phone detector: {exam.phone_detector.get().describe()}")
+
+    # Pipeline logs share stdout with the report, so only warnings are kept without --verbose
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+    sockets, elapsed = asyncio.run(replay(frames, args))
+    report(sockets, elapsed, args)
+
+if __name__ == "__main__":
+    main()
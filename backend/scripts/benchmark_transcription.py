@@ -0,0 +1,73 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import re
+import time
+import numpy as np
+from audio_decoder import decode_audio, AUDIO_SAMPLE_RATE
+from transcription import create_transcriber, TRANSCRIPTION_BACKENDS
+
+# Usage:
+#   python scripts/benchmark_transcription.py uploads/video_*.webm --backend faster-whisper --workers 4
+#   python scripts/benchmark_transcription.py interview.mp4 --backend whisper-cpp --model models/ggml-base.bin
+#
+# The reference is the current engine: openai-whisper base on the whole file, no VAD.
+
+def words(text):
+    return re.findall(r"[\w']+", text.lower())
+
+def word_error_rate(reference, hypothesis):
+    """Levenshtein distance over words, divided by the reference length."""
+    ref, hyp = words(reference), words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = np.arange(len(hyp) + 1)
+    for i, ref_word in enumerate(ref, 1):
+        current = np.empty_like(previous)
+        current[0] = i
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word))
+        previous = current
+    return previous[-1] / len(ref)
+
+def run(transcriber, recordings):
+    """Returns (transcripts, real-time factor = processing time / audio duration)."""
+    transcripts = []
+    elapsed = 0.0
+    duration = 0.0
+    for audio in recordings:
+        start = time.perf_counter()
+        transcripts.append(transcriber.transcribe(audio)["text"])
+        elapsed += time.perf_counter() - start
+        duration += len(audio) / AUDIO_SAMPLE_RATE
+    return transcripts, elapsed / duration
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare a transcription backend against openai-whisper base")
+    parser.add_argument("files", nargs="+", help="Audio or video files")
+    parser.add_argument("--backend", default="faster-whisper", choices=TRANSCRIPTION_BACKENDS)
+    parser.add_argument("--model", default="base", help="Model name or path for the candidate backend")
+    parser.add_argument("--workers", type=int, default=2, help="Chunks decoded in parallel")
+    parser.add_argument("--chunk-seconds", type=float, default=30)
+    parser.add_argument("--no-vad", action="store_true", help="Transcribe silences too")
+    args = parser.parse_args()
+
+    recordings = [decode_audio(path) for path in args.files]
+    total = sum(len(audio) for audio in recordings) / AUDIO_SAMPLE_RATE
+    print(f"Loaded {len(recordings)} recordings, {total / 60:.1f} min of audio")
+
+    reference = create_transcriber("whisper", "base", vad=False, chunk_seconds=None)
+    reference_texts, reference_rtf = run(reference, recordings)
+    print(f"Reference  whisper base (no VAD)            RTF {reference_rtf:.3f}")
+
+    candidate = create_transcriber(args.backend, args.model, workers=args.workers, vad=not args.no_vad, chunk_seconds=args.chunk_seconds)
+    candidate_texts, candidate_rtf = run(candidate, recordings)
+    print(f"Candidate  {str(candidate.describe()):<32} RTF {candidate_rtf:.3f} ({reference_rtf / candidate_rtf:.2f}x faster)")
+
+    wers = [word_error_rate(r, c) for r, c in zip(reference_texts, candidate_texts)]
+    print(f"Word error rate vs reference: mean {np.mean(wers) * 100:.1f}% | worst {max(wers) * 100:.1f}%")
+
+if __name__ == "__main__":
+    main()
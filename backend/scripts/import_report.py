@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import subprocess
+
+# Usage:
+#   python scripts/import_report.py --role api
+#   python scripts/import_report.py --role api --budget-ms 1500   # fails CI when startup regresses
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_importtime(stderr):
+    """Returns [(cumulative ms, module)] from `python -X importtime` output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|", 2)
+        imports.append((int(cumulative) / 1000, module.strip()))
+    return imports
+
+def main():
+    parser = argparse.ArgumentParser(description="Report what `import main` costs for an APP_ROLE")
+    parser.add_argument("--role", default="api", choices=["api", "proctoring", "media", "all"])
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, help="Exit non-zero when importing main takes longer than this")
+    args = parser.parse_args()
+
+    env = dict(os.environ, APP_ROLE=args.role)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        sys.exit(result.returncode)
+
+    imports = parse_importtime(result.stderr)
+    total_ms = next((ms for ms, module in imports if module == "main"), 0.0)
+    print(f"import main with APP_ROLE={args.role}: {total_ms:.0f} ms")
+    for ms, module in sorted(imports, reverse=True)[:args.top]:
+        print(f"  {ms:9.1f} ms  {module}")
+
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"Import budget exceeded: {total_ms:.0f} ms > {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import os
+import cv2
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+def load_frames(source, limit=None):
+    """Loads BGR frames from a directory of images (sorted by name) or a video file."""
+    frames = []
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if not name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            frame = cv2.imread(os.path.join(source, name), cv2.IMREAD_COLOR)
+            if frame is not None:
+                frames.append(frame)
+            if limit and len(frames) >= limit:
+                break
+    else:
+        cap = cv2.VideoCapture(source)
+        if not cap.isOpened():
+            raise ValueError(f"Could not open video: {source}")
+        while not limit or len(frames) < limit:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+        cap.release()
+
+    if not frames:
+        raise ValueError(f"No frames found in {source}")
+    return frames
@@ -0,0 +1,67 @@
+import os
+import re
+
+# Configuration
+# Windows scored per pipeline call
+SENTIMENT_BATCH_SIZE = int(os.getenv('SENTIMENT_BATCH_SIZE', '16'))
+# Keeps every window well inside the model's 512-token limit
+SENTIMENT_MAX_WORDS = int(os.getenv('SENTIMENT_MAX_WORDS', '120'))
+# Used to give untimed text (no Whisper segments) an approximate duration
+WORDS_PER_SECOND = 2.5
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def transcript_windows(result, max_words=SENTIMENT_MAX_WORDS):
+    """Groups Whisper segments into windows of whole segments up to max_words, keeping their times."""
+    segments = result.get("segments") or []
+    if not segments:
+        # No timings: fall back to sentences with a duration estimated from word count
+        segments, clock = [], 0.0
+        for sentence in filter(None, (s.strip() for s in SENTENCE_END.split(result.get("text", "")))):
+            duration = len(sentence.split()) / WORDS_PER_SECOND
+            segments.append({"start": clock, "end": clock + duration, "text": sentence})
+            clock += duration
+
+    windows = []
+    for segment in segments:
+        text = segment["text"].strip()
+        words = len(text.split())
+        if not words:
+            continue
+        if windows and windows[-1]["words"] + words <= max_words:
+            window = windows[-1]
+            window["text"] += " " + text
+            window["end"] = segment["end"]
+            window["words"] += words
+        else:
+            windows.append({"start": segment["start"], "end": segment["end"], "text": text, "words": words})
+    return windows
+
+
+def positivity(result):
+    """Probability-like positivity in [0, 1] from a POSITIVE/NEGATIVE pipeline result."""
+    return result["score"] if result["label"].upper() == "POSITIVE" else 1 - result["score"]
+
+
+def score_transcript(result, classify, batch_size=SENTIMENT_BATCH_SIZE):
+    """Scores a transcript window by window and aggregates them weighted by duration.
+
+    classify takes a list of texts and returns one {"label", "score"} per text.
+    """
+    windows = transcript_windows(result)
+    if not windows:
+        return {"label": "NEUTRAL", "positivity": 0.5, "timeline": []}
+
+    scores = []
+    for i in range(0, len(windows), batch_size):
+        scores.extend(classify([window["text"] for window in windows[i:i + batch_size]]))
+
+    timeline = [
+        {"start": window["start"], "end": window["end"], "label": score["label"], "positivity": round(positivity(score), 4)}
+        for window, score in zip(windows, scores)
+    ]
+    # Windows without a usable duration still count a little
+    weights = [max(entry["end"] - entry["start"], 0.1) for entry in timeline]
+    overall = sum(weight * entry["positivity"] for weight, entry in zip(weights, timeline)) / sum(weights)
+    return {"label": "POSITIVE" if overall >= 0.5 else "NEGATIVE", "positivity": overall, "timeline": timeline}
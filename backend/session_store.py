@@ -0,0 +1,125 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Configuration
+# memory: this process only (single worker), sqlite: all workers on one node, redis: all nodes
+PROCTOR_SESSION_STORE = os.getenv('PROCTOR_SESSION_STORE', 'memory').lower()
+PROCTOR_SESSION_STORE_URL = os.getenv('PROCTOR_SESSION_STORE_URL')
+# Sessions not updated for this long (ended, or on a dead worker) are ignored and expire
+PROCTOR_SESSION_TTL_SECONDS = int(os.getenv('PROCTOR_SESSION_TTL_SECONDS', '300'))
+PROCTOR_SESSION_SYNC_SECONDS = float(os.getenv('PROCTOR_SESSION_SYNC_SECONDS', '1'))
+PROCTOR_SESSION_RECENT_EVENTS = int(os.getenv('PROCTOR_SESSION_RECENT_EVENTS', '50'))
+
+
+class InMemorySessionStore:
+    """Process-local store; only correct with a single uvicorn worker."""
+
+    name = "memory"
+
+    def __init__(self, ttl=PROCTOR_SESSION_TTL_SECONDS):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.sessions = {}
+
+    def save(self, candidate_id, state):
+        with self.lock:
+            self.sessions[candidate_id] = (time.time(), state)
+
+    def load(self, candidate_id):
+        with self.lock:
+            entry = self.sessions.get(candidate_id)
+        if entry is None or time.time() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    def delete(self, candidate_id):
+        with self.lock:
+            self.sessions.pop(candidate_id, None)
+
+    def count(self):
+        cutoff = time.time() - self.ttl
+        with self.lock:
+            return sum(1 for updated_at, _ in self.sessions.values() if updated_at >= cutoff)
+
+
+class SqliteSessionStore:
+    """Shares session state between the workers of one node through a SQLite file in WAL mode."""
+
+    name = "sqlite"
+
+    def __init__(self, path=None, ttl=PROCTOR_SESSION_TTL_SECONDS):
+        self.path = path or "proctoring_sessions.db"
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS proctoring_sessions ("
+            "candidate_id INTEGER PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def save(self, candidate_id, state):
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO proctoring_sessions (candidate_id, state, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(candidate_id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at",
+                (candidate_id, json.dumps(state), time.time())
+            )
+
+    def load(self, candidate_id):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT state FROM proctoring_sessions WHERE candidate_id = ? AND updated_at >= ?",
+                (candidate_id, time.time() - self.ttl)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete(self, candidate_id):
+        with self.lock:
+            self.conn.execute("DELETE FROM proctoring_sessions WHERE candidate_id = ?", (candidate_id,))
+
+    def count(self):
+        with self.lock:
+            (count,) = self.conn.execute(
+                "SELECT COUNT(*) FROM proctoring_sessions WHERE updated_at >= ?", (time.time() - self.ttl,)
+            ).fetchone()
+        return count
+
+
+class RedisSessionStore:
+    """Shares session state across workers and nodes through any Redis-protocol server."""
+
+    name = "redis"
+    key_prefix = "proctoring:session:"
+
+    def __init__(self, url=None, ttl=PROCTOR_SESSION_TTL_SECONDS):
+        import redis
+        self.ttl = ttl
+        self.client = redis.Redis.from_url(url or "redis://localhost:6379/0")
+
+    def save(self, candidate_id, state):
+        self.client.set(f"{self.key_prefix}{candidate_id}", json.dumps(state), ex=self.ttl)
+
+    def load(self, candidate_id):
+        value = self.client.get(f"{self.key_prefix}{candidate_id}")
+        return json.loads(value) if value else None
+
+    def delete(self, candidate_id):
+        self.client.delete(f"{self.key_prefix}{candidate_id}")
+
+    def count(self):
+        return sum(1 for _ in self.client.scan_iter(match=f"{self.key_prefix}*"))
+
+
+def create_session_store(kind=PROCTOR_SESSION_STORE, url=PROCTOR_SESSION_STORE_URL):
+    if kind == "memory":
+        return InMemorySessionStore()
+    if kind == "sqlite":
+        return SqliteSessionStore(url)
+    if kind == "redis":
+        return RedisSessionStore(url)
+    raise ValueError(f"Unknown session store '{kind}', expected memory, sqlite or redis")
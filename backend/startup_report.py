@@ -0,0 +1,32 @@
+import time
+from contextlib import contextmanager
+from lazy_models import model_status
+
+# Imported first by main.py, so this approximates the start of the app import
+process_start = time.perf_counter()
+import_times = {}
+imports_done_ms = None
+
+
+@contextmanager
+def timed_import(name):
+    """Records how long the imports inside the block take, in ms."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        import_times[name] = round((time.perf_counter() - start) * 1000, 1)
+
+
+def mark_imports_done():
+    global imports_done_ms
+    imports_done_ms = round((time.perf_counter() - process_start) * 1000, 1)
+
+
+def startup_report(role):
+    return {
+        "role": role,
+        "total_import_ms": imports_done_ms,
+        "imports_ms": dict(sorted(import_times.items(), key=lambda item: item[1], reverse=True)),
+        "models": model_status()
+    }
@@ -1,7 +1,11 @@
 import re
 import json
+import logging
 import ollama
 import hjson
+from app_logging import get_logger
+
+logger = get_logger(__name__)
 
 def jsonValidator(json_str, json_format):
     prompt = f"""You are a JSON validator. Convert the following malformed JSON into a valid JSON format:
@@ -41,7 +45,7 @@ def clean_and_convert_json(model_output, json_format):
             # Try appending a closing brace and parse again
             try:
                 json_str = jsonValidator(json_str, json_format)
-                print("corrected json string -> ",json_str)
+                logger.debug("corrected json string -> %s", json_str)
                 match1 = re.search(r'```json\s*(.*?)\s*```', json_str, re.DOTALL)
                 if not match1:
                     raise ValueError("No JSON content found")
@@ -56,16 +60,16 @@ def clean_and_convert_json(model_output, json_format):
                 json_str = json_str.replace(", ]", " ]")
                 json_str = re.sub(r'\s+', ' ', json_str)  # Remove excessive spaces
                 json_str = json_str.strip()
-                print("corrected json -> ",json_str)
+                logger.debug("corrected json -> %s", json_str)
                 return hjson.loads(json_str)
             except Exception as e:
-                print("Invalid JSON even after fixing:", e)
+                logger.warning("Invalid JSON even after fixing: %s", e)
                 return {
                     "error": "Failed to parse JSON"
                 }
 
     except Exception as e:
-        print("Error:", e)
+        logger.warning("Error parsing model output as JSON: %s", e)
         return {
             "error": str(e)
         }
@@ -73,7 +77,9 @@ def clean_and_convert_json(model_output, json_format):
 def getJSON(data, json_format):
     json_obj = clean_and_convert_json(data, json_format)
     if json_obj:
-        print("Valid JSON Object:", json.dumps(json_obj, indent=4))
+        # Model outputs are large; serialize them only when debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Valid JSON Object: %s", json.dumps(json_obj))
     else:
-        print("Failed to parse JSON")
+        logger.warning("Failed to parse JSON")
     return json_obj
\ No newline at end of file
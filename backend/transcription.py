@@ -0,0 +1,210 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from audio_decoder import AUDIO_SAMPLE_RATE
+
+# Configuration
+# whisper: openai-whisper (PyTorch fp32), faster-whisper: CTranslate2 INT8, whisper-cpp: pywhispercpp bindings
+TRANSCRIPTION_BACKEND = os.getenv('TRANSCRIPTION_BACKEND', 'whisper').lower()
+TRANSCRIPTION_MODEL = os.getenv('TRANSCRIPTION_MODEL', 'base')
+TRANSCRIPTION_COMPUTE_TYPE = os.getenv('TRANSCRIPTION_COMPUTE_TYPE', 'int8')
+# Chunks decoded in parallel (faster-whisper / whisper-cpp only) and CPU threads per chunk
+TRANSCRIPTION_WORKERS = int(os.getenv('TRANSCRIPTION_WORKERS', '2'))
+TRANSCRIPTION_THREADS = int(os.getenv('TRANSCRIPTION_THREADS', str(max(1, (os.cpu_count() or 2) // 2))))
+# Speech is cut into chunks of at most this length, split at the quietest point before the limit
+TRANSCRIPTION_CHUNK_SECONDS = float(os.getenv('TRANSCRIPTION_CHUNK_SECONDS', '30'))
+# Silence trimming and chunking; unset means on for faster-whisper / whisper-cpp and off for
+# openai-whisper, which windows the whole recording itself
+TRANSCRIPTION_VAD = os.getenv('TRANSCRIPTION_VAD', '').lower() == 'true' if os.getenv('TRANSCRIPTION_VAD') else None
+
+TRANSCRIPTION_BACKENDS = ("whisper", "faster-whisper", "whisper-cpp")
+
+# Energy VAD: 30 ms frames, speech when louder than the noise floor by VAD_THRESHOLD_DB
+VAD_FRAME_SECONDS = 0.03
+VAD_THRESHOLD_DB = 12.0
+# The threshold is kept between these absolute levels: faint hiss over digital silence is never
+# speech, and a loud frame always is, even when the noise floor (or a steady tone) is high
+VAD_MIN_THRESHOLD_DBFS = -55.0
+VAD_MAX_THRESHOLD_DBFS = -35.0
+# Pauses shorter than this stay inside one region; regions keep this much padding
+VAD_MIN_SILENCE_SECONDS = 0.5
+VAD_PAD_SECONDS = 0.2
+# Neighbouring regions share a chunk only when the silence between them is shorter than this
+VAD_MAX_MERGE_GAP_SECONDS = 2.0
+# A region longer than a chunk is cut at its quietest frame within this long before the limit
+VAD_SPLIT_SEARCH_SECONDS = 5.0
+
+
+def speech_regions(audio, sample_rate=AUDIO_SAMPLE_RATE):
+    """(start, end) sample ranges that contain speech, from frame energy against the noise floor.
+
+    Falls back to the whole clip when nothing clears the threshold, so a misjudged
+    recording is transcribed in full rather than coming back empty.
+    """
+    frame = int(sample_rate * VAD_FRAME_SECONDS)
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return [(0, len(audio))] if len(audio) else []
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    energy_db = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+    # 10th percentile of frame energy approximates the background noise
+    threshold = np.clip(np.percentile(energy_db, 10) + VAD_THRESHOLD_DB, VAD_MIN_THRESHOLD_DBFS, VAD_MAX_THRESHOLD_DBFS)
+    voiced = energy_db > threshold
+    if not voiced.any():
+        return [(0, len(audio))]
+
+    # Rising / falling edges of the voiced mask
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.astype(np.int8), [0]))))
+    starts, ends = edges[0::2], edges[1::2]
+    min_gap = int(VAD_MIN_SILENCE_SECONDS / VAD_FRAME_SECONDS)
+    pad = int(VAD_PAD_SECONDS * sample_rate)
+
+    regions = []
+    for start, end in zip(starts, ends):
+        if regions and start - regions[-1][1] < min_gap:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+    return [(max(0, start * frame - pad), min(len(audio), end * frame + pad)) for start, end in regions]
+
+
+def split_point(audio, start, limit, sample_rate=AUDIO_SAMPLE_RATE):
+    """Sample index of the quietest VAD frame in the VAD_SPLIT_SEARCH_SECONDS before limit, so a cut lands in a pause."""
+    frame = int(sample_rate * VAD_FRAME_SECONDS)
+    search_start = max(start + frame, limit - int(VAD_SPLIT_SEARCH_SECONDS * sample_rate))
+    n_frames = (limit - search_start) // frame
+    if n_frames < 1:
+        return limit
+    frames = audio[search_start:search_start + n_frames * frame].reshape(n_frames, frame)
+    quietest = int(np.argmin(np.mean(frames * frames, axis=1)))
+    return search_start + quietest * frame + frame // 2
+
+
+def chunk_regions(regions, audio, sample_rate=AUDIO_SAMPLE_RATE, max_seconds=TRANSCRIPTION_CHUNK_SECONDS):
+    """Packs speech regions into chunks of at most max_seconds, splitting longer regions at pauses."""
+    if not max_seconds:
+        return list(regions)
+    max_samples = int(max_seconds * sample_rate)
+    max_gap = int(VAD_MAX_MERGE_GAP_SECONDS * sample_rate)
+    chunks = []
+    for start, end in regions:
+        chunk_start = start
+        while chunk_start < end:
+            chunk_end = end if end - chunk_start <= max_samples else split_point(audio, chunk_start, chunk_start + max_samples, sample_rate)
+            if chunks and chunk_start - chunks[-1][1] <= max_gap and chunk_end - chunks[-1][0] <= max_samples:
+                chunks[-1] = (chunks[-1][0], chunk_end)
+            else:
+                chunks.append((chunk_start, chunk_end))
+            chunk_start = chunk_end
+    return chunks
+
+
+class WhisperTranscriber:
+    """openai-whisper in PyTorch; not safe to call from several threads at once."""
+
+    name = "whisper"
+    parallel = False
+    # Windows the whole recording itself; VAD and chunking would change its output
+    chunked = False
+
+    def __init__(self, model=TRANSCRIPTION_MODEL):
+        import torch
+        import whisper
+        self.model = whisper.load_model(model).to("cuda" if torch.cuda.is_available() else "cpu")
+
+    def transcribe_chunk(self, audio):
+        result = self.model.transcribe(audio)
+        segments = [{"start": s["start"], "end": s["end"], "text": s["text"]} for s in result.get("segments", [])]
+        return segments, result.get("language")
+
+
+class FasterWhisperTranscriber:
+    """CTranslate2 Whisper with INT8 weights; num_workers lets chunks decode concurrently."""
+
+    name = "faster-whisper"
+    parallel = True
+    chunked = True
+
+    def __init__(self, model=TRANSCRIPTION_MODEL, compute_type=TRANSCRIPTION_COMPUTE_TYPE,
+                 threads=TRANSCRIPTION_THREADS, workers=TRANSCRIPTION_WORKERS):
+        from faster_whisper import WhisperModel
+        self.model = WhisperModel(model, device="cpu", compute_type=compute_type, cpu_threads=threads, num_workers=workers)
+
+    def transcribe_chunk(self, audio):
+        segments, info = self.model.transcribe(audio, beam_size=5)
+        return [{"start": s.start, "end": s.end, "text": s.text} for s in segments], info.language
+
+
+class WhisperCppTranscriber:
+    """whisper.cpp through pywhispercpp (optional: pip install pywhispercpp); one context per worker."""
+
+    name = "whisper-cpp"
+    parallel = True
+    chunked = True
+
+    def __init__(self, model=TRANSCRIPTION_MODEL, threads=TRANSCRIPTION_THREADS, workers=TRANSCRIPTION_WORKERS):
+        try:
+            from pywhispercpp.model import Model
+        except ImportError as e:
+            raise RuntimeError("TRANSCRIPTION_BACKEND=whisper-cpp needs the pywhispercpp package") from e
+        # A whisper.cpp context is not re-entrant, so each worker thread gets its own
+        self.models = [Model(model, n_threads=threads, print_progress=False, print_realtime=False) for _ in range(max(1, workers))]
+        self.free = list(self.models)
+
+    def transcribe_chunk(self, audio):
+        model = self.free.pop()
+        try:
+            segments = model.transcribe(audio)
+        finally:
+            self.free.append(model)
+        # whisper.cpp timestamps are in centiseconds
+        return [{"start": s.t0 / 100, "end": s.t1 / 100, "text": s.text} for s in segments], None
+
+
+class Transcriber:
+    """Trims silence, cuts long recordings into chunks and decodes them in parallel where the engine allows."""
+
+    def __init__(self, engine, workers=TRANSCRIPTION_WORKERS, vad=TRANSCRIPTION_VAD, chunk_seconds=TRANSCRIPTION_CHUNK_SECONDS):
+        # vad=None follows the engine; chunk_seconds=None decodes each speech region (or the whole
+        # file without VAD) in one piece, which is what openai-whisper gets unless VAD is asked for
+        self.engine = engine
+        self.workers = max(1, workers) if engine.parallel else 1
+        self.vad = engine.chunked if vad is None else vad
+        self.chunk_seconds = chunk_seconds if engine.chunked or self.vad else None
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="transcription")
+
+    def transcribe(self, audio, sample_rate=AUDIO_SAMPLE_RATE):
+        """Same shape as openai-whisper's result: text, language and timed segments."""
+        audio = np.asarray(audio, dtype=np.float32)
+        regions = speech_regions(audio, sample_rate) if self.vad else [(0, len(audio))]
+        chunks = chunk_regions(regions, audio, sample_rate, self.chunk_seconds)
+        results = list(self.executor.map(lambda chunk: self.engine.transcribe_chunk(audio[chunk[0]:chunk[1]]), chunks))
+
+        segments = []
+        for (start, _), (chunk_segments, _) in zip(chunks, results):
+            offset = start / sample_rate
+            segments.extend(
+                {"start": segment["start"] + offset, "end": segment["end"] + offset, "text": segment["text"]}
+                for segment in chunk_segments
+            )
+        languages = [language for _, language in results if language]
+        return {
+            "text": "".join(segment["text"] for segment in segments).strip(),
+            "language": languages[0] if languages else None,
+            "segments": segments
+        }
+
+    def describe(self):
+        return {"backend": self.engine.name, "workers": self.workers, "vad": self.vad, "chunk_seconds": self.chunk_seconds}
+
+
+def create_transcriber(backend=TRANSCRIPTION_BACKEND, model=TRANSCRIPTION_MODEL, workers=TRANSCRIPTION_WORKERS, **options):
+    if backend == "whisper":
+        engine = WhisperTranscriber(model)
+    elif backend == "faster-whisper":
+        engine = FasterWhisperTranscriber(model, workers=workers)
+    elif backend == "whisper-cpp":
+        engine = WhisperCppTranscriber(model, workers=workers)
+    else:
+        raise ValueError(f"Unknown transcription backend '{backend}', expected one of {', '.join(TRANSCRIPTION_BACKENDS)}")
+    return Transcriber(engine, workers=workers, **options)
@@ -0,0 +1,141 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import cv2
+import numpy as np
+from app_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Configuration
+# Frames analyzed per second of video, independent of the source frame rate
+MEDIA_SAMPLE_FPS = float(os.getenv('MEDIA_SAMPLE_FPS', '2'))
+# Hard cap per interview; long videos are sampled more sparsely instead of truncated
+MEDIA_MAX_FRAMES = int(os.getenv('MEDIA_MAX_FRAMES', '600'))
+# Sampled frames are downscaled to this width (emotion models work on small face crops)
+MEDIA_FRAME_WIDTH = int(os.getenv('MEDIA_FRAME_WIDTH', '640'))
+# ffmpeg: decode + fps filter + scale in one ffmpeg process, opencv: grab() and only retrieve() sampled frames
+MEDIA_SAMPLER = os.getenv('MEDIA_SAMPLER', 'ffmpeg').lower()
+
+
+def probe_video(video_path):
+    """Returns (width, height, duration in seconds or None)."""
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise ValueError(f"Could not open video: {video_path}")
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+    cap.release()
+    # Browser recordings (WebM) often carry no frame count
+    duration = frame_count / fps if fps > 0 and frame_count > 0 else None
+    return width, height, duration
+
+
+def sampling_rate(duration, sample_fps=MEDIA_SAMPLE_FPS, max_frames=MEDIA_MAX_FRAMES):
+    """Lowers the rate for long videos so max_frames covers the whole interview."""
+    if duration and duration * sample_fps > max_frames:
+        return max_frames / duration
+    return sample_fps
+
+
+def scaled_size(width, height, max_width=MEDIA_FRAME_WIDTH):
+    if not max_width or width <= max_width:
+        return width, height
+    # Even dimensions keep ffmpeg's scaler and rawvideo output happy
+    return max_width - max_width % 2, int(height * max_width / width) // 2 * 2
+
+
+def sample_frames_ffmpeg(video_path, rate, max_frames, width, height, start=0.0, end=None):
+    # -ss before -i seeks on the demuxer instead of decoding up to start
+    command = ["ffmpeg", "-v", "error", "-ss", f"{start:.3f}", "-i", str(video_path)]
+    if end is not None:
+        command += ["-t", f"{end - start:.3f}"]
+    command += [
+        "-vf", f"fps={rate:.6f},scale={width}:{height}",
+        "-frames:v", str(max_frames),
+        "-f", "rawvideo", "-pix_fmt", "bgr24", "pipe:1"
+    ]
+    frame_size = width * height * 3
+    if frame_size <= 0:
+        # read(0) would return b"" forever without ever reaching end of stream
+        raise ValueError(f"Invalid frame size {width}x{height} for {video_path}")
+    # stderr goes to a temp file: a pipe nobody reads could fill up and stall ffmpeg
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr, bufsize=frame_size)
+        finished = False
+        try:
+            index = 0
+            while True:
+                buffer = process.stdout.read(frame_size)
+                if len(buffer) < frame_size:
+                    finished = True
+                    break
+                yield start + index / rate, np.frombuffer(buffer, np.uint8).reshape(height, width, 3)
+                index += 1
+        finally:
+            process.stdout.close()
+            # Only a consumer that stopped early leaves ffmpeg running
+            if not finished:
+                process.kill()
+            returncode = process.wait()
+        if returncode != 0:
+            stderr.seek(0)
+            message = stderr.read().decode(errors="replace").strip()
+            raise RuntimeError(f"ffmpeg could not sample frames from {video_path}: {message}")
+
+
+def sample_frames_opencv(video_path, rate, max_frames, width, height, start=0.0, end=None, max_width=MEDIA_FRAME_WIDTH):
+    # width/height None: the container did not say, so size from the first decoded frame
+    cap = cv2.VideoCapture(str(video_path))
+    interval_ms = 1000 / rate
+    next_ms = start * 1000
+    sampled = 0
+    if start:
+        cap.set(cv2.CAP_PROP_POS_MSEC, next_ms)
+    try:
+        # grab() only advances the stream; the costly retrieve() (color conversion, copy) runs for sampled frames
+        while sampled < max_frames and cap.grab():
+            position_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+            if end is not None and position_ms >= end * 1000:
+                break
+            if position_ms + 1e-3 < next_ms:
+                continue
+            ret, frame = cap.retrieve()
+            if not ret:
+                break
+            if width is None:
+                width, height = scaled_size(frame.shape[1], frame.shape[0], max_width)
+            if frame.shape[1] != width:
+                frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+            yield position_ms / 1000, frame
+            sampled += 1
+            next_ms = max(next_ms, position_ms) + interval_ms
+    finally:
+        cap.release()
+
+
+def sample_frames(video_path, sample_fps=MEDIA_SAMPLE_FPS, max_frames=MEDIA_MAX_FRAMES, max_width=MEDIA_FRAME_WIDTH,
+                  sampler=MEDIA_SAMPLER, start=0.0, end=None):
+    """Yields (timestamp in seconds, BGR frame) at a fixed time-based rate, decoding as little as possible.
+
+    start/end (seconds) restrict sampling to one segment of the video.
+    """
+    width, height, duration = probe_video(video_path)
+    if end is not None:
+        duration = end - start
+    elif duration is not None:
+        duration -= start
+    rate = sampling_rate(duration, sample_fps, max_frames)
+    if not width or not height:
+        # ffmpeg's raw output needs the size up front; OpenCV can take it from the frames
+        logger.warning("No frame size in %s, sampling with OpenCV", video_path)
+        return sample_frames_opencv(video_path, rate, max_frames, None, None, start, end, max_width)
+    width, height = scaled_size(width, height, max_width)
+    if sampler == "ffmpeg" and shutil.which("ffmpeg"):
+        return sample_frames_ffmpeg(video_path, rate, max_frames, width, height, start, end)
+    if sampler == "ffmpeg":
+        logger.warning("ffmpeg not found, sampling %s with OpenCV", video_path)
+    return sample_frames_opencv(video_path, rate, max_frames, width, height, start, end)
@@ -0,0 +1,144 @@
+import os
+import numpy as np
+from scipy.signal import find_peaks, resample_poly
+from audio_decoder import AUDIO_SAMPLE_RATE
+
+# Configuration
+# Pitch is tracked on audio downsampled to this rate (voice F0 stays well below its Nyquist)
+PITCH_SAMPLE_RATE = int(os.getenv('PITCH_SAMPLE_RATE', '8000'))
+# Audio is processed in blocks of this length, so memory does not grow with the recording
+PITCH_BLOCK_SECONDS = float(os.getenv('PITCH_BLOCK_SECONDS', '10'))
+PITCH_FMIN = 75.0
+PITCH_FMAX = 400.0
+# YIN aperiodicity threshold; lower is stricter about calling a frame voiced
+YIN_THRESHOLD = 0.15
+FRAME_SECONDS = 0.032
+HOP_SECONDS = 0.01
+# Frames quieter than this (dB below the loudest frame of the block) count as silence
+SILENCE_DB = 40.0
+# ...and so do frames below this absolute level, so a silent block is not judged against itself
+SILENCE_FLOOR_DBFS = -60.0
+# Syllable nuclei are energy peaks at least this far apart
+SYLLABLE_MIN_GAP_SECONDS = 0.1
+
+
+def yin_pitch(frames, sample_rate, fmin=PITCH_FMIN, fmax=PITCH_FMAX, threshold=YIN_THRESHOLD):
+    """F0 in Hz per frame (NaN when unvoiced) with YIN, computed for all frames at once.
+
+    frames has shape (n_frames, window + max_lag).
+    """
+    min_lag = int(sample_rate / fmax)
+    max_lag = int(sample_rate / fmin)
+    window = frames.shape[1] - max_lag
+    n_fft = 1 << int(np.ceil(np.log2(frames.shape[1] + window)))
+
+    # Difference function d(tau) = E(x[0:W]) + E(x[tau:tau+W]) - 2 * r(tau), with r via FFT
+    spectrum = np.fft.rfft(frames, n_fft)
+    head_spectrum = np.fft.rfft(frames[:, :window], n_fft)
+    correlation = np.fft.irfft(np.conj(head_spectrum) * spectrum, n_fft)[:, :max_lag + 1]
+    squares = np.cumsum(np.pad(frames * frames, ((0, 0), (1, 0))), axis=1)
+    lags = np.arange(max_lag + 1)
+    energy_head = squares[:, window][:, None]
+    energy_lagged = squares[:, lags + window] - squares[:, lags]
+    difference = np.maximum(energy_head + energy_lagged - 2 * correlation, 0.0)
+
+    # Cumulative mean normalized difference
+    cumulative = np.cumsum(difference[:, 1:], axis=1)
+    cmnd = np.ones_like(difference)
+    # Where there is no energy to normalize by (digital silence) the frame stays at 1, i.e. unvoiced
+    has_energy = cumulative > 1e-10
+    cmnd[:, 1:] = np.where(has_energy, difference[:, 1:] * lags[1:] / np.where(has_energy, cumulative, 1.0), 1.0)
+
+    # First dip below the threshold, then the minimum of that dip
+    candidates = cmnd[:, min_lag:]
+    below = candidates < threshold
+    voiced = below.any(axis=1)
+    first = np.argmax(below, axis=1)
+    positions = np.arange(candidates.shape[1])
+    after_first = positions >= first[:, None]
+    left_dip = np.cumsum(after_first & ~below, axis=1) > 0
+    in_dip = after_first & below & ~left_dip
+    lag = np.argmin(np.where(in_dip, candidates, np.inf), axis=1)
+
+    # Parabolic interpolation around the chosen lag
+    inner = np.clip(lag, 1, candidates.shape[1] - 2)
+    rows = np.arange(len(frames))
+    left, center, right = candidates[rows, inner - 1], candidates[rows, inner], candidates[rows, inner + 1]
+    curvature = left - 2 * center + right
+    shift = np.where(np.abs(curvature) > 1e-12, 0.5 * (left - right) / np.where(curvature == 0, 1, curvature), 0.0)
+    refined = np.where(lag == inner, inner + np.clip(shift, -1, 1), lag) + min_lag
+
+    return np.where(voiced, sample_rate / refined, np.nan)
+
+
+class VoiceFeatureExtractor:
+    """Streams PCM through YIN in fixed-size blocks, keeping only running sums."""
+
+    def __init__(self, input_rate=AUDIO_SAMPLE_RATE, sample_rate=PITCH_SAMPLE_RATE, block_seconds=PITCH_BLOCK_SECONDS):
+        self.input_rate = input_rate
+        self.sample_rate = sample_rate
+        self.block = int(block_seconds * sample_rate)
+        self.window = int(FRAME_SECONDS * sample_rate)
+        self.hop = int(HOP_SECONDS * sample_rate)
+        self.frame_length = self.window + int(sample_rate / PITCH_FMIN)
+        self.frames = 0
+        self.voiced_frames = 0
+        self.pitch_sum = 0.0
+        self.pitch_sum_squares = 0.0
+        self.syllables = 0
+
+    def downsample(self, audio):
+        if self.input_rate == self.sample_rate:
+            return audio
+        divisor = np.gcd(self.input_rate, self.sample_rate)
+        return resample_poly(audio, self.sample_rate // divisor, self.input_rate // divisor).astype(np.float32)
+
+    def process_block(self, samples):
+        if len(samples) < self.frame_length:
+            return
+        frames = np.lib.stride_tricks.sliding_window_view(samples, self.frame_length)[::self.hop]
+        energy_db = 10 * np.log10(np.mean(frames[:, :self.window] ** 2, axis=1) + 1e-10)
+        loud = (energy_db > energy_db.max() - SILENCE_DB) & (energy_db > SILENCE_FLOOR_DBFS)
+
+        pitch = yin_pitch(frames, self.sample_rate)
+        voiced = loud & ~np.isnan(pitch)
+        voiced_pitch = pitch[voiced]
+        self.frames += len(frames)
+        self.voiced_frames += len(voiced_pitch)
+        self.pitch_sum += float(voiced_pitch.sum())
+        self.pitch_sum_squares += float((voiced_pitch ** 2).sum())
+
+        # Speaking rate: energy peaks (syllable nuclei) inside voiced stretches
+        envelope = np.where(voiced, energy_db, energy_db.min())
+        peaks, _ = find_peaks(envelope, distance=max(1, int(SYLLABLE_MIN_GAP_SECONDS / HOP_SECONDS)), prominence=3.0)
+        self.syllables += int(voiced[peaks].sum())
+
+    def process(self, audio):
+        """Feeds a whole recording block by block; only one block is resampled and framed at a time."""
+        input_block = int(self.block * self.input_rate / self.sample_rate)
+        # Blocks overlap by one frame so no frame is lost at the seams
+        overlap = int(self.frame_length * self.input_rate / self.sample_rate)
+        step = max(1, input_block - overlap)
+        for start in range(0, len(audio), step):
+            self.process_block(self.downsample(audio[start:start + input_block]))
+            if start + input_block >= len(audio):
+                break
+        return self.features()
+
+    def features(self):
+        voiced_seconds = self.voiced_frames * HOP_SECONDS
+        if not self.voiced_frames:
+            return {"pitch_mean": 0.0, "pitch_variance": 0.0, "voiced_ratio": 0.0, "speaking_rate": 0.0}
+        mean = self.pitch_sum / self.voiced_frames
+        return {
+            "pitch_mean": mean,
+            "pitch_variance": max(0.0, self.pitch_sum_squares / self.voiced_frames - mean * mean),
+            "voiced_ratio": self.voiced_frames / self.frames,
+            # Syllables per second of voiced speech
+            "speaking_rate": self.syllables / voiced_seconds
+        }
+
+
+def voice_features(audio, sample_rate=AUDIO_SAMPLE_RATE):
+    """Pitch mean / variance (Hz), voiced ratio and speaking rate of mono float32 PCM."""
+    return VoiceFeatureExtractor(input_rate=sample_rate).process(audio)
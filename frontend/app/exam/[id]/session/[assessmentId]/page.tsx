@@ -5,6 +5,7 @@ import { useExam } from '@/contexts/ExamContext'
 import Editor from "@monaco-editor/react"
 import axios from 'axios'
 import { useParams } from 'next/navigation'
+import { parseProctoringMessage } from '@/lib/proctoring'
 
 interface MonitoringStatus {
   phone_detected: boolean
@@ -193,6 +194,10 @@ export default function ExamSession() {
 
   useEffect(() => {
     let intervalId: ReturnType<typeof setInterval> | undefined
+    let restartCapture: (() => void) | undefined
+    // Capture rate and resolution; the server adjusts these with control messages
+    let captureIntervalMs = 1000
+    let maxFrameWidth = 640
     let isConnected = false
     let frameCount = 0
     let reconnectAttempts = 0
@@ -200,7 +205,8 @@ export default function ExamSession() {
 
     const connectWebSocket = () => {
       console.log('Attempting WebSocket connection...')
-      const ws = new WebSocket(`ws://localhost:8000/ws/${candidateId}`)
+      const ws = new WebSocket(`ws://localhost:8000/ws/${candidateId}?protocol=binary&annotate=none&adaptive=true&fps=${1000 / captureIntervalMs}&assessment_id=${assessmentId}`)
+      ws.binaryType = 'arraybuffer'
       wsRef.current = ws
 
       ws.onopen = () => {
@@ -243,7 +249,16 @@ export default function ExamSession() {
 
       ws.onmessage = (event) => {
         try {
-          const result = JSON.parse(event.data)
+          const result = parseProctoringMessage(event.data)
+          if (result.type === 'control') {
+            console.log('Adjusting capture rate:', result)
+            captureIntervalMs = 1000 / result.fps
+            maxFrameWidth = result.max_width
+            if (intervalId) {
+              restartCapture?.()
+            }
+            return
+          }
           console.log('Received frame data:', result)
           setMonitoringStatus(result)
         } catch (error) {
@@ -280,8 +295,7 @@ export default function ExamSession() {
             canvas.width = videoRef.current.videoWidth || 640
             canvas.height = videoRef.current.videoHeight || 480
 
-            // Start the interval
-            intervalId = setInterval(() => {
+            const captureFrame = () => {
               if (!videoRef.current || !wsRef.current || wsRef.current.readyState !== WebSocket.OPEN) {
                 console.log('Skipping frame:', {
                   videoReady: !!videoRef.current,
@@ -292,29 +306,26 @@ export default function ExamSession() {
               }
 
               try {
-                // Update canvas size if video dimensions change
-                if (canvas.width !== videoRef.current.videoWidth || canvas.height !== videoRef.current.videoHeight) {
-                  canvas.width = videoRef.current.videoWidth
-                  canvas.height = videoRef.current.videoHeight
+                // Update canvas size if video dimensions or the requested resolution change
+                const scale = Math.min(1, maxFrameWidth / videoRef.current.videoWidth)
+                const width = Math.round(videoRef.current.videoWidth * scale)
+                const height = Math.round(videoRef.current.videoHeight * scale)
+                if (canvas.width !== width || canvas.height !== height) {
+                  canvas.width = width
+                  canvas.height = height
                 }
 
                 // Draw the current video frame
-                ctx.drawImage(videoRef.current, 0, 0)
+                ctx.drawImage(videoRef.current, 0, 0, width, height)
 
                 // Convert to blob and send
                 canvas.toBlob(
                   (blob) => {
                     if (blob && wsRef.current?.readyState === WebSocket.OPEN) {
-                      const reader = new FileReader()
-                      reader.onloadend = () => {
-                        if (typeof reader.result === 'string') {
-                          const base64data = reader.result.split(',')[1]
-                          wsRef.current?.send(base64data)
-                          frameCount++
-                          console.log('Frame sent:', frameCount)
-                        }
-                      }
-                      reader.readAsDataURL(blob)
+                      // Raw JPEG bytes, no base64 round trip
+                      wsRef.current.send(blob)
+                      frameCount++
+                      console.log('Frame sent:', frameCount)
                     }
                   },
                   'image/jpeg',
@@ -323,7 +334,16 @@ export default function ExamSession() {
               } catch (error) {
                 console.error('Error sending frame:', error)
               }
-            }, 1000) // Send frame every 100ms
+            }
+
+            // Start (or restart, when the server changes the rate) the interval
+            restartCapture = () => {
+              if (intervalId) {
+                clearInterval(intervalId)
+              }
+              intervalId = setInterval(captureFrame, captureIntervalMs)
+            }
+            restartCapture()
           }
         } else {
           // Wait for video to be ready
@@ -378,7 +398,7 @@ export default function ExamSession() {
       console.log('Cleaning up resources...')
       cleanupResources()
     }
-  }, [candidateId])
+  }, [candidateId, assessmentId])
 
   useEffect(() => {
     // Send final honesty score when component unmounts
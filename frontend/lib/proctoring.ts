@@ -0,0 +1,19 @@
+// Binary proctoring messages are laid out as
+//   4-byte big-endian header length | UTF-8 JSON header | optional JPEG bytes
+// (see backend/frame_protocol.py)
+export function unpackProctoringMessage(data: ArrayBuffer): { header: any, payload: Blob | null } {
+  const headerLength = new DataView(data).getUint32(0)
+  const headerEnd = 4 + headerLength
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(data, 4, headerLength)))
+  const payload = data.byteLength > headerEnd
+    ? new Blob([new Uint8Array(data, headerEnd)], { type: 'image/jpeg' })
+    : null
+  return { header, payload }
+}
+
+export function parseProctoringMessage(data: string | ArrayBuffer): any {
+  if (typeof data === 'string') {
+    return JSON.parse(data)
+  }
+  return unpackProctoringMessage(data).header
+}